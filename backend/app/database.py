@@ -1,31 +1,137 @@
 from __future__ import annotations
 
+import json
+import logging
+import math
 import os
+import sqlite3
 from contextlib import contextmanager
 from pathlib import Path
 from typing import Iterator
 
-from sqlalchemy import create_engine
+import orjson
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.pool import QueuePool
 
 default_db_path = Path(__file__).resolve().parent.parent / "instagram_monitor.db"
 DB_PATH = Path(os.getenv("DATABASE_PATH", default_db_path))
 DB_PATH.parent.mkdir(parents=True, exist_ok=True)
 SQLALCHEMY_DATABASE_URL = f"sqlite:///{DB_PATH}"
 
+logger = logging.getLogger(__name__)
+
+
+def _json_serializer(value) -> str:
+    # JSON columns (event payloads, scheduler payloads) go through orjson instead of the stdlib.
+    # Values orjson would store differently fall back to json.dumps so stored data is unchanged:
+    # integers beyond 64 bits and NaN/Infinity (which orjson writes as null) are kept, and
+    # datetimes/dataclasses are rejected just as before.
+    try:
+        encoded = orjson.dumps(
+            value,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS,
+        )
+    except orjson.JSONEncodeError:
+        return json.dumps(value)
+    if b"null" in encoded and _has_non_finite_float(value):
+        return json.dumps(value)
+    return encoded.decode()
+
+
+def _has_non_finite_float(value) -> bool:
+    if isinstance(value, float):
+        return not math.isfinite(value)
+    if isinstance(value, dict):
+        return any(_has_non_finite_float(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return any(_has_non_finite_float(item) for item in value)
+    return False
+
+
+def _json_deserializer(value: str):
+    try:
+        return orjson.loads(value)
+    except orjson.JSONDecodeError:
+        # Rows written by the old stdlib serializer may hold NaN/Infinity, which orjson rejects.
+        return json.loads(value)
+
+
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False},
+    connect_args={"check_same_thread": False, "timeout": 30},
+    poolclass=QueuePool,
+    pool_size=int(os.getenv("DATABASE_POOL_SIZE", "5")),
+    max_overflow=int(os.getenv("DATABASE_MAX_OVERFLOW", "10")),
+    pool_pre_ping=True,
+    pool_recycle=1800,
     future=True,
+    json_serializer=_json_serializer,
+    json_deserializer=_json_deserializer,
 )
 
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA foreign_keys=ON",
+    "PRAGMA busy_timeout=30000",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+)
+
+
+@event.listens_for(engine, "connect")
+def _apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    if engine.url.database in (None, "", ":memory:"):
+        return
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+OPTIMIZE_INTERVAL_SECONDS = int(os.getenv("DATABASE_OPTIMIZE_INTERVAL_SECONDS", "3600"))
+# Short enough that a busy writer makes the periodic optimize skip a round, not stall.
+OPTIMIZE_BUSY_TIMEOUT_SECONDS = float(os.getenv("DATABASE_OPTIMIZE_BUSY_TIMEOUT_SECONDS", "1"))
+
+
+def run_periodic_optimize() -> None:
+    """Refresh stale planner statistics on a dedicated connection outside the pool."""
+    connection = sqlite3.connect(DB_PATH, timeout=OPTIMIZE_BUSY_TIMEOUT_SECONDS)
+    try:
+        connection.execute("PRAGMA optimize")
+    except sqlite3.Error:
+        logger.warning("PRAGMA optimize failed", exc_info=True)
+    finally:
+        connection.close()
+
+
+def optimize_database() -> None:
+    """Gather planner statistics on first run, then let SQLite refresh the stale ones."""
+    with engine.connect() as conn:
+        has_stats = conn.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'"
+        ).first()
+        if not has_stats:
+            conn.exec_driver_sql("ANALYZE")
+        conn.exec_driver_sql("PRAGMA optimize")
+        conn.commit()
+
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, future=True)
 
 Base = declarative_base()
 
 
 def get_session() -> Iterator:
-    db = SessionLocal()
+    # A plain generator so FastAPI opens and closes the session in its threadpool,
+    # alongside the synchronous handlers that use it. Request sessions are short-lived,
+    # so objects keep their committed values instead of re-selecting them on the next
+    # attribute access after commit.
+    db = SessionLocal(expire_on_commit=False)
     try:
         yield db
     finally:
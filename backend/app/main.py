@@ -2,32 +2,48 @@ from __future__ import annotations
 
 import asyncio
 import contextlib
+import functools
+import io
 import os
-import json
+import re
+import logging
 import shutil
+import sqlite3
 import tempfile
+import threading
 import zipfile
 from datetime import datetime
+from logging.handlers import RotatingFileHandler
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional
 
-from fastapi import BackgroundTasks, Depends, FastAPI, File, Form, HTTPException, UploadFile
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, StreamingResponse
+from fastapi import BackgroundTasks, Depends, FastAPI, File, Form, HTTPException, Request, UploadFile
+from fastapi.responses import FileResponse, ORJSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
-from sqlalchemy import text
-from sqlalchemy.orm import Session, joinedload
-
-from .database import DB_PATH, SessionLocal, engine
+import orjson
+from sqlalchemy import delete, func, insert, inspect, lambda_stmt, select, true, tuple_, update
+from sqlalchemy.orm import Session, contains_eager, load_only, raiseload, selectinload
+
+from .database import (
+    DB_PATH,
+    OPTIMIZE_INTERVAL_SECONDS,
+    SessionLocal,
+    engine,
+    get_session,
+    optimize_database,
+    run_periodic_optimize,
+)
+from .middleware import PureCORSMiddleware
 from .models import (
-    Base,
     Club,
     ExtractedEvent,
     Post,
     ClassificationModeEnum,
     ScheduledJob,
     ScheduledJobRun,
+    SystemSetting,
     ensure_default_settings,
+    run_migrations,
     DEFAULT_APIFY_ACTOR_ID,
 )
 from pydantic import ValidationError
@@ -51,7 +67,6 @@ from .schemas import (
     ApifyImportStats,
     GeminiApiKeyUpdate,
     ClubEventsExport,
-    EventExportItem,
     ScheduledJobCreate,
     ScheduledJobUpdate,
     ScheduledJobOut,
@@ -64,22 +79,86 @@ from .services.gemini_extractor import (
     GeminiExtractionError,
     auto_extract_for_post,
     extract_event_data_for_post,
+    extraction_confidence_from_payload,
+    resolve_gemini_api_key,
 )
 from .services.monitor import monitor_service, RateLimitError, ApifyIntegrationError
 from .services.scheduler import scheduler_service
+from .services.settings_cache import settings_cache
 from .utils.apify_client import ApifyRunTimeoutError
 from .utils.csv_loader import import_clubs_from_csv
 from .utils.image_downloader import get_image_url
 
-app = FastAPI(title="Instagram Event Monitor")
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+_log_handlers: List[logging.Handler] = [logging.StreamHandler()]
+if os.getenv("LOG_FILE"):
+    _log_handlers.append(
+        RotatingFileHandler(
+            os.environ["LOG_FILE"],
+            maxBytes=int(os.getenv("LOG_FILE_MAX_BYTES", str(10 * 1024 * 1024))),
+            backupCount=int(os.getenv("LOG_FILE_BACKUP_COUNT", "5")),
+        )
+    )
+logging.basicConfig(
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
+    format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    handlers=_log_handlers,
 )
+logger = logging.getLogger(__name__)
+
+
+def _prepare_database() -> bool:
+    """Run the blocking startup work and report whether the scheduler should be enabled."""
+    if os.getenv("RUN_MIGRATIONS") == "1":
+        run_migrations(engine)
+    elif not inspect(engine).has_table(SystemSetting.__tablename__):
+        # Fresh or empty database: create the schema rather than failing on the first query.
+        logger.info("Database schema not found; running migrations (normally done by `python -m app.scripts.migrate`)")
+        run_migrations(engine)
+    optimize_database()
+    session = SessionLocal()
+    try:
+        settings = ensure_default_settings(session)
+        monitor_service.session_file_path = INSTALOADER_SESSION_PATH
+        if INSTALOADER_SESSION_PATH.exists():
+            try:
+                monitor_service.configure_from_settings(settings)
+            except Exception:
+                pass
+        return bool(getattr(settings, "scheduler_enabled", False))
+    finally:
+        session.close()
+
+
+async def _optimize_database_periodically() -> None:
+    while True:
+        await asyncio.sleep(OPTIMIZE_INTERVAL_SECONDS)
+        await asyncio.to_thread(run_periodic_optimize)
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI):
+    scheduler_enabled = await asyncio.to_thread(_prepare_database)
+    await scheduler_service.startup(scheduler_enabled)
+    if OPTIMIZE_INTERVAL_SECONDS > 0:
+        app.state.optimize_task = asyncio.create_task(_optimize_database_periodically())
+    try:
+        yield
+    finally:
+        for name in ("monitor_task", "optimize_task"):
+            task: Optional[asyncio.Task] = getattr(app.state, name, None)
+            if task:
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+        await scheduler_service.shutdown()
+
+
+# Keyset cursor returned by /posts; exposed to cross-origin clients by the CORS middleware.
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+app = FastAPI(title="Instagram Event Monitor", default_response_class=ORJSONResponse, lifespan=lifespan)
+
+app.add_middleware(PureCORSMiddleware, expose_headers=[NEXT_CURSOR_HEADER])
 
 # Mount static files for serving images
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
@@ -91,39 +170,38 @@ IMAGES_DIR = Path("app/static/images")
 IMAGES_DIR.mkdir(parents=True, exist_ok=True)
 
 
-async def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+def _sse(payload: Dict[str, Any]) -> bytes:
+    return b"data: " + orjson.dumps(payload) + b"\n\n"
 
 
-@app.on_event("startup")
-async def on_startup() -> None:
-    Base.metadata.create_all(bind=engine)
-    session = SessionLocal()
-    try:
-        settings = ensure_default_settings(session)
-        monitor_service.session_file_path = INSTALOADER_SESSION_PATH
-        if INSTALOADER_SESSION_PATH.exists():
-            try:
-                monitor_service.configure_from_settings(settings)
-            except Exception:
-                pass
-        await scheduler_service.startup(bool(getattr(settings, "scheduler_enabled", False)))
-    finally:
-        session.close()
+# Frames that never change between requests are encoded once at import.
+SSE_NO_ACTIVE_CLUBS = _sse({"error": "No active clubs found"})
+SSE_INSTALOADER_UNAVAILABLE = _sse({"error": "Instaloader session is not available"})
+SSE_APIFY_NOT_CONFIGURED = _sse({"error": "Apify integration is not configured"})
+SSE_APIFY_CLIENT_UNAVAILABLE = _sse({"status": "error", "error": "Apify integration is not configured."})
 
+# SSE comment line; clients ignore it, but it keeps idle proxies from closing the stream.
+SSE_HEARTBEAT = b": keepalive\n\n"
+SSE_HEARTBEAT_SECONDS = float(os.getenv("SSE_HEARTBEAT_SECONDS", "15"))
 
-@app.on_event("shutdown")
-async def on_shutdown() -> None:
-    task: Optional[asyncio.Task] = getattr(app.state, "monitor_task", None)
-    if task:
-        task.cancel()
-        with contextlib.suppress(asyncio.CancelledError):
-            await task
-    await scheduler_service.shutdown()
+
+async def _sse_heartbeats(task: asyncio.Future) -> AsyncIterator[bytes]:
+    """Yield keepalive comments until ``task`` finishes."""
+    while True:
+        done, _ = await asyncio.wait({task}, timeout=SSE_HEARTBEAT_SECONDS)
+        if done:
+            return
+        yield SSE_HEARTBEAT
+
+
+# Fixed-shape frames sent for every club; only the values are encoded per frame.
+SSE_STARTING_TEMPLATE = b'data: {"status":"starting","message":%b}\n\n'
+SSE_PROCESSING_TEMPLATE = (
+    b'data: {"status":"processing","current_club":%b,"progress":%d,"total":%d,"message":%b}\n\n'
+)
+SSE_COMPLETED_CLUB_TEMPLATE = (
+    b'data: {"status":"completed_club","club":%b,"posts_found":%d,"progress":%d,"total":%d}\n\n'
+)
 
 
 @app.get("/health")
@@ -131,26 +209,22 @@ async def health_check() -> dict:
     return {"status": "ok"}
 
 
-def _cleanup_file(path: Path) -> None:
-    try:
-        path.unlink(missing_ok=True)
-    except OSError:
-        pass
-
-
 def _clear_directory(path: Path) -> None:
     if not path.exists():
         return
-    for child in path.iterdir():
-        try:
-            if child.is_dir():
-                shutil.rmtree(child)
-            else:
-                child.unlink()
-        except OSError:
-            pass
+    # scandir hands back the entry type with each name, so no per-entry stat is needed.
+    with os.scandir(path) as entries:
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    shutil.rmtree(entry.path)
+                else:
+                    os.unlink(entry.path)
+            except OSError:
+                pass
 
 
+@functools.lru_cache(maxsize=4096)
 def _normalize_local_image_path(image_path: Optional[str]) -> Optional[str]:
     if not image_path:
         return None
@@ -160,6 +234,19 @@ def _normalize_local_image_path(image_path: Optional[str]) -> Optional[str]:
     return normalized.strip("/") or None
 
 
+def _parse_export_timestamp(value: str, default: datetime) -> datetime:
+    # fromisoformat accepts the trailing "Z" from Python 3.11 on; the replace only
+    # runs for older interpreters or malformed values.
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        pass
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return default
+
+
 def _import_event_export(data: Any) -> None:
     if not isinstance(data, list):
         raise HTTPException(status_code=400, detail="Event export JSON must be a list of clubs")
@@ -169,104 +256,170 @@ def _import_event_export(data: Any) -> None:
     except ValidationError as exc:
         raise HTTPException(status_code=400, detail=f"Invalid event export format: {exc}") from exc
 
+    _normalize_local_image_path.cache_clear()
+    now = datetime.utcnow()
     session = SessionLocal()
     try:
-        session.execute(text("DELETE FROM extracted_events"))
-        session.execute(text("DELETE FROM posts"))
-        session.execute(text("DELETE FROM clubs"))
-        session.commit()
-
-        now = datetime.utcnow()
-        for club_export in clubs_export:
-            club = Club(
-                name=club_export.club_name,
-                username=club_export.club_username,
-                active=True,
-            )
-            session.add(club)
-            session.flush()
-
+        # Replace everything in one transaction; each table is written with a single batched INSERT.
+        for model in (ExtractedEvent, Post, Club):
+            session.execute(delete(model).execution_options(synchronize_session=False))
+
+        club_ids: List[int] = []
+        if clubs_export:
+            club_ids = session.scalars(
+                insert(Club).returning(Club.id, sort_by_parameter_order=True),
+                [
+                    {"name": club_export.club_name, "username": club_export.club_username, "active": True}
+                    for club_export in clubs_export
+                ],
+            ).all()
+
+        post_rows: List[Dict[str, Any]] = []
+        event_exports: List[Any] = []
+        for club_id, club_export in zip(club_ids, clubs_export):
             for event_export in club_export.events:
-                try:
-                    raw_ts = event_export.post_timestamp.replace("Z", "+00:00")
-                    post_timestamp = datetime.fromisoformat(raw_ts)
-                except Exception:
-                    post_timestamp = now
-
-                post = Post(
-                    club_id=club.id,
-                    instagram_id=event_export.post_instagram_id,
-                    image_url=event_export.post_image_url,
-                    local_image_path=_normalize_local_image_path(event_export.post_image_url),
-                    caption=event_export.post_caption,
-                    post_timestamp=post_timestamp,
-                    collected_at=now,
-                    is_event_poster=True,
-                    processed=True,
-                    classification_confidence=event_export.extraction_confidence,
+                post_rows.append(
+                    {
+                        "club_id": club_id,
+                        "instagram_id": event_export.post_instagram_id,
+                        "image_url": event_export.post_image_url,
+                        "local_image_path": _normalize_local_image_path(event_export.post_image_url),
+                        "caption": event_export.post_caption,
+                        "post_timestamp": _parse_export_timestamp(event_export.post_timestamp, now),
+                        "collected_at": now,
+                        "is_event_poster": True,
+                        "processed": True,
+                        "classification_confidence": event_export.extraction_confidence,
+                    }
                 )
-                session.add(post)
-                session.flush()
-
-                if event_export.payload is not None:
-                    extracted = ExtractedEvent(
-                        post_id=post.id,
-                        event_data_json=event_export.payload,
-                        extraction_confidence=event_export.extraction_confidence,
-                    )
-                    session.add(extracted)
+                event_exports.append(event_export)
+
+        post_ids: List[int] = []
+        if post_rows:
+            post_ids = session.scalars(
+                insert(Post).returning(Post.id, sort_by_parameter_order=True),
+                post_rows,
+            ).all()
+
+        event_rows = [
+            {
+                "post_id": post_id,
+                "event_data_json": event_export.payload,
+                "extraction_confidence": event_export.extraction_confidence,
+            }
+            for post_id, event_export in zip(post_ids, event_exports)
+            if event_export.payload is not None
+        ]
+        if event_rows:
+            session.execute(insert(ExtractedEvent), event_rows)
 
         session.commit()
     finally:
         session.close()
 
 
-@app.get("/export/full", response_class=FileResponse)
-async def export_full_backup(background_tasks: BackgroundTasks) -> FileResponse:
-    timestamp = datetime.utcnow().strftime("%Y%m%d-%H%M%S")
-    tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".zip")
-    backup_path = Path(tmp.name)
-    tmp.close()
+BACKUP_CHUNK_SIZE = 1 << 20
+BACKUP_IMAGES_PREFIX = "static/images/"
+_backup_import_lock = threading.Lock()
 
-    try:
-        with zipfile.ZipFile(backup_path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
-            if DB_PATH.exists():
-                archive.write(DB_PATH, arcname="instagram_monitor.db")
-            if IMAGES_DIR.exists():
-                for file_path in IMAGES_DIR.rglob("*"):
-                    if file_path.is_file():
-                        archive.write(
-                            file_path,
-                            arcname=f"static/images/{file_path.relative_to(IMAGES_DIR)}",
-                        )
-    except Exception:
-        backup_path.unlink(missing_ok=True)
-        raise
 
-    background_tasks.add_task(_cleanup_file, backup_path)
-    return FileResponse(
-        backup_path,
+class _ZipStreamBuffer(io.RawIOBase):
+    """Write-only sink that lets ``zipfile`` stream an archive without seeking."""
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._buffer += data
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+def _iter_backup_archive() -> Iterator[bytes]:
+    entries: List[tuple] = []
+    if DB_PATH.exists():
+        entries.append((DB_PATH, "instagram_monitor.db"))
+    if IMAGES_DIR.exists():
+        for root, _dirs, files in os.walk(IMAGES_DIR):
+            for name in files:
+                file_path = Path(root, name)
+                entries.append((file_path, f"{BACKUP_IMAGES_PREFIX}{file_path.relative_to(IMAGES_DIR).as_posix()}"))
+
+    sink = _ZipStreamBuffer()
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for file_path, arcname in entries:
+            info = zipfile.ZipInfo.from_file(file_path, arcname=arcname)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            with file_path.open("rb") as src, archive.open(info, "w") as dst:
+                while chunk := src.read(BACKUP_CHUNK_SIZE):
+                    dst.write(chunk)
+                    data = sink.drain()
+                    if data:
+                        yield data
+    yield sink.drain()
+
+
+@app.get("/export/full", response_class=StreamingResponse)
+def export_full_backup() -> StreamingResponse:
+    timestamp = datetime.utcnow().strftime("%Y%m%d-%H%M%S")
+    # Fold the write-ahead log back into the main file so the archived copy is complete.
+    with engine.connect() as conn:
+        conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+    return StreamingResponse(
+        _iter_backup_archive(),
         media_type="application/zip",
-        filename=f"event-monitor-backup-{timestamp}.zip",
-        background=background_tasks,
+        headers={"Content-Disposition": f'attachment; filename="event-monitor-backup-{timestamp}.zip"'},
     )
 
 
-def _validate_zip_entry(name: str) -> None:
-    path = Path(name)
-    if path.is_absolute() or ".." in path.parts:
+# Absolute paths, drive letters, or a ".." segment anywhere in the entry name.
+UNSAFE_ZIP_ENTRY = re.compile(r"^[/\\]|^[A-Za-z]:|(?:^|[/\\])\.\.(?:[/\\]|$)")
+
+
+def _validate_zip_entries(names: Iterable[str]) -> None:
+    if any(UNSAFE_ZIP_ENTRY.search(name) for name in names):
         raise HTTPException(status_code=400, detail="Archive contains unsafe paths")
 
 
-@app.post("/import/full")
-async def import_full_backup(file: UploadFile = File(...)) -> Dict[str, str]:
+def _restore_database_file(source_path: Path) -> None:
+    """Copy ``source_path`` into the live database with SQLite's online backup API.
+
+    The copy goes through SQLite's own locking and WAL, so connections still checked out
+    of the pool see the restored pages instead of a file replaced underneath them.
+    """
+    source = sqlite3.connect(source_path)
+    try:
+        try:
+            source.execute("PRAGMA schema_version").fetchone()
+        except sqlite3.DatabaseError as exc:
+            raise HTTPException(status_code=400, detail="Archive database is not a valid SQLite file") from exc
+        target = engine.raw_connection()
+        try:
+            source.backup(target.driver_connection)
+            target.driver_connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        finally:
+            target.close()
+    finally:
+        source.close()
+    # Idle pooled connections reopen against the restored schema.
+    engine.dispose()
+
+
+def _restore_backup(file: UploadFile) -> Dict[str, str]:
     filename = (file.filename or "").lower()
 
     if filename.endswith(".json"):
-        content = await file.read()
+        content = file.file.read()
         try:
-            data = json.loads(content)
-        except json.JSONDecodeError as exc:
+            data = orjson.loads(content)
+        except orjson.JSONDecodeError as exc:
             raise HTTPException(status_code=400, detail="Uploaded file is not valid JSON") from exc
         finally:
             file.file.close()
@@ -277,51 +430,56 @@ async def import_full_backup(file: UploadFile = File(...)) -> Dict[str, str]:
     elif filename.endswith(".zip"):
         with tempfile.NamedTemporaryFile(delete=False, suffix=".zip") as tmp:
             try:
-                shutil.copyfileobj(file.file, tmp)
+                shutil.copyfileobj(file.file, tmp, length=BACKUP_CHUNK_SIZE)
             finally:
                 file.file.close()
             temp_zip_path = Path(tmp.name)
 
         try:
             with zipfile.ZipFile(temp_zip_path, "r") as archive:
-                if "instagram_monitor.db" not in archive.namelist():
+                entries = archive.infolist()
+                if "instagram_monitor.db" not in {info.filename for info in entries}:
                     raise HTTPException(status_code=400, detail="Archive missing instagram_monitor.db")
-                for info in archive.infolist():
-                    _validate_zip_entry(info.filename)
+                _validate_zip_entries(info.filename for info in entries)
 
-                with tempfile.TemporaryDirectory() as extract_dir:
-                    archive.extractall(path=extract_dir)
-                    extract_path = Path(extract_dir)
-                    new_db_path = extract_path / "instagram_monitor.db"
-                    if not new_db_path.exists():
-                        raise HTTPException(status_code=400, detail="Archive missing instagram_monitor.db")
-                    new_images_dir = extract_path / "static" / "images"
-
-                    engine.dispose()
+                # Stage the database next to the live file so a corrupt entry cannot truncate it.
+                DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+                staged_db_path = DB_PATH.with_name(f"{DB_PATH.name}.importing")
+                try:
+                    with archive.open("instagram_monitor.db") as src, staged_db_path.open("wb") as dst:
+                        shutil.copyfileobj(src, dst, length=BACKUP_CHUNK_SIZE)
+                except BaseException:
+                    staged_db_path.unlink(missing_ok=True)
+                    raise
 
+                try:
                     try:
-                        # Copy database
-                        DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-                        shutil.copy2(new_db_path, DB_PATH)
-
-                        # Copy images with better error handling
-                        IMAGES_DIR.mkdir(parents=True, exist_ok=True)
-                        _clear_directory(IMAGES_DIR)
-                        if new_images_dir.exists():
-                            # Copy files one by one to handle permission issues
-                            for src_file in new_images_dir.rglob("*"):
-                                if src_file.is_file():
-                                    rel_path = src_file.relative_to(new_images_dir)
-                                    dst_file = IMAGES_DIR / rel_path
-                                    dst_file.parent.mkdir(parents=True, exist_ok=True)
-                                    try:
-                                        shutil.copy2(src_file, dst_file)
-                                    except OSError as e:
-                                        print(f"Warning: Could not copy {src_file}: {e}")
-                                        # Continue with other files
-                    except Exception as e:
-                        print(f"Error during import: {e}")
-                        raise HTTPException(status_code=500, detail=f"Import failed: {str(e)}")
+                        _restore_database_file(staged_db_path)
+                    finally:
+                        staged_db_path.unlink(missing_ok=True)
+
+                    # Stream images straight out of the archive, one file at a time
+                    IMAGES_DIR.mkdir(parents=True, exist_ok=True)
+                    _clear_directory(IMAGES_DIR)
+                    for info in entries:
+                        if info.is_dir() or not info.filename.startswith(BACKUP_IMAGES_PREFIX):
+                            continue
+                        rel_path = info.filename[len(BACKUP_IMAGES_PREFIX) :]
+                        if not rel_path:
+                            continue
+                        dst_file = IMAGES_DIR / rel_path
+                        dst_file.parent.mkdir(parents=True, exist_ok=True)
+                        try:
+                            with archive.open(info) as src, dst_file.open("wb") as dst:
+                                shutil.copyfileobj(src, dst, length=BACKUP_CHUNK_SIZE)
+                        except OSError as e:
+                            logger.warning("Could not copy %s: %s", info.filename, e)
+                            # Continue with other files
+                except (zipfile.BadZipFile, HTTPException):
+                    raise
+                except Exception as e:
+                    logger.exception("Error during backup import")
+                    raise HTTPException(status_code=500, detail=f"Import failed: {str(e)}")
 
         except zipfile.BadZipFile as exc:
             raise HTTPException(status_code=400, detail="Uploaded file is not a valid zip archive") from exc
@@ -333,6 +491,9 @@ async def import_full_backup(file: UploadFile = File(...)) -> Dict[str, str]:
     else:
         raise HTTPException(status_code=400, detail="Upload a .zip backup or event export .json file")
 
+    # Restored backups may come from an older release; bring their schema up to date.
+    run_migrations(engine)
+    settings_cache.invalidate()
     session = SessionLocal()
     try:
         settings = ensure_default_settings(session)
@@ -344,143 +505,148 @@ async def import_full_backup(file: UploadFile = File(...)) -> Dict[str, str]:
     return {"message": message}
 
 
+@app.post("/import/full")
+async def import_full_backup(file: UploadFile = File(...)) -> Dict[str, str]:
+    # Refuse overlapping restores rather than letting them race on DB_PATH.
+    if not _backup_import_lock.acquire(blocking=False):
+        raise HTTPException(status_code=409, detail="A backup import is already in progress")
+    try:
+        if await monitor_service.has_active_runs():
+            raise HTTPException(status_code=409, detail="A fetch is in progress; try the import again once it finishes")
+        # Hold the exclusive run guard and pause scheduled jobs so nothing writes while the
+        # database is being replaced.
+        scheduler_service.pause()
+        try:
+            async with monitor_service.run_guard("restore"):
+                return await asyncio.to_thread(_restore_backup, file)
+        finally:
+            scheduler_service.resume()
+    finally:
+        _backup_import_lock.release()
+
+
+def _write_settings(db: Session, **values: Any) -> SystemSetting:
+    """Apply ``values`` to the settings row with a single UPDATE ... RETURNING and commit."""
+    first_id = select(SystemSetting.id).order_by(SystemSetting.id).limit(1).scalar_subquery()
+    settings = db.execute(
+        update(SystemSetting)
+        .where(SystemSetting.id == first_id)
+        .values(**values)
+        .returning(SystemSetting)
+        .execution_options(synchronize_session=False, populate_existing=True)
+    ).scalar_one_or_none()
+    if settings is None:
+        # Fresh database without a settings row yet.
+        settings = ensure_default_settings(db)
+        for field, value in values.items():
+            setattr(settings, field, value)
+    db.commit()
+    settings_cache.invalidate()
+    return settings
+
+
 @app.get("/monitor/status", response_model=MonitorStatus)
-async def monitor_status(db: Session = Depends(get_db)) -> MonitorStatus:
-    settings = ensure_default_settings(db)
+def monitor_status(db: Session = Depends(get_session)) -> MonitorStatus:
+    settings = settings_cache.get(db)
     return _render_status(settings)
 
 
 @app.post("/monitor/start", response_model=MonitorStatus)
-async def monitor_start(db: Session = Depends(get_db)) -> MonitorStatus:
-    settings = ensure_default_settings(db)
-    settings.monitoring_enabled = True
-    db.commit()
-    db.refresh(settings)
+def monitor_start(db: Session = Depends(get_session)) -> MonitorStatus:
+    settings = _write_settings(db, monitoring_enabled=True)
     return _render_status(settings)
 
 
 @app.post("/monitor/stop", response_model=MonitorStatus)
-async def monitor_stop(db: Session = Depends(get_db)) -> MonitorStatus:
-    settings = ensure_default_settings(db)
-    settings.monitoring_enabled = False
-    db.commit()
-    db.refresh(settings)
+def monitor_stop(db: Session = Depends(get_session)) -> MonitorStatus:
+    settings = _write_settings(db, monitoring_enabled=False)
     return _render_status(settings)
 
 
 @app.get("/settings", response_model=SystemSettingsOut)
-async def get_system_settings(db: Session = Depends(get_db)) -> SystemSettingsOut:
-    settings = ensure_default_settings(db)
+def get_system_settings(db: Session = Depends(get_session)) -> SystemSettingsOut:
+    settings = settings_cache.get(db)
     return _system_settings_out(settings)
 
 
+def _apply_settings_update(db: Session, payload: SystemSettingsUpdate):
+    """Write the fields present in ``payload``; returns the rendered settings and the applied changes."""
+    changes = payload.model_dump(exclude_unset=True, exclude_none=True)
+    if changes.get("monitor_interval_minutes", 1) < 1:
+        raise HTTPException(status_code=400, detail="Monitor interval must be at least 1 minute")
+    if changes.get("club_fetch_delay_seconds", 0) < 0:
+        raise HTTPException(status_code=400, detail="Club fetch delay cannot be negative")
+    if changes.get("instagram_fetcher", "instaloader") not in {"instaloader", "apify"}:
+        raise HTTPException(status_code=400, detail="Invalid Instagram fetcher selection")
+
+    settings = ensure_default_settings(db)
+    if "apify_actor_id" in changes:
+        changes["apify_actor_id"] = DEFAULT_APIFY_ACTOR_ID
+    if "instagram_fetcher" in changes:
+        changes.setdefault("apify_enabled", changes["instagram_fetcher"] == "apify")
+    if "scheduler_enabled" in changes and changes["scheduler_enabled"] == bool(settings.scheduler_enabled):
+        del changes["scheduler_enabled"]
+
+    for field, value in changes.items():
+        setattr(settings, field, value)
+    if changes:
+        db.commit()
+    return _system_settings_out(settings), changes
+
+
 @app.patch("/settings", response_model=SystemSettingsOut)
 async def update_system_settings(
     payload: SystemSettingsUpdate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_session),
 ) -> SystemSettingsOut:
-    settings = ensure_default_settings(db)
-    updated = False
-    scheduler_toggled = False
-    if payload.classification_mode is not None:
-        settings.classification_mode = payload.classification_mode
-        updated = True
-    if payload.monitor_interval_minutes is not None:
-        if payload.monitor_interval_minutes < 1:
-            raise HTTPException(status_code=400, detail="Monitor interval must be at least 1 minute")
-        settings.monitor_interval_minutes = payload.monitor_interval_minutes
-        updated = True
-    if payload.club_fetch_delay_seconds is not None:
-        if payload.club_fetch_delay_seconds < 0:
-            raise HTTPException(status_code=400, detail="Club fetch delay cannot be negative")
-        settings.club_fetch_delay_seconds = payload.club_fetch_delay_seconds
-        updated = True
-    if payload.apify_enabled is not None:
-        settings.apify_enabled = payload.apify_enabled
-        updated = True
-    if payload.apify_actor_id is not None:
-        settings.apify_actor_id = DEFAULT_APIFY_ACTOR_ID
-        updated = True
-    if payload.apify_results_limit is not None:
-        settings.apify_results_limit = payload.apify_results_limit
-        updated = True
-    if payload.instagram_fetcher is not None:
-        fetcher = payload.instagram_fetcher.lower()
-        if fetcher not in {"instaloader", "apify"}:
-            raise HTTPException(status_code=400, detail="Invalid Instagram fetcher selection")
-        settings.instagram_fetcher = fetcher
-        if payload.apify_enabled is None:
-            settings.apify_enabled = fetcher == "apify"
-        updated = True
-    if payload.gemini_auto_extract is not None:
-        settings.gemini_auto_extract = bool(payload.gemini_auto_extract)
-        updated = True
-    if payload.scheduler_enabled is not None:
-        desired = bool(payload.scheduler_enabled)
-        if bool(getattr(settings, "scheduler_enabled", False)) != desired:
-            settings.scheduler_enabled = desired
-            scheduler_toggled = True
-            updated = True
-    if updated:
-        db.commit()
-        db.refresh(settings)
+    settings_out, changes = await asyncio.to_thread(_apply_settings_update, db, payload)
+    if changes:
+        settings_cache.invalidate()
         monitor_service.clear_last_error()
-        if scheduler_toggled:
-            await scheduler_service.set_enabled(bool(settings.scheduler_enabled))
-    return _system_settings_out(settings)
+        if "scheduler_enabled" in changes:
+            await scheduler_service.set_enabled(changes["scheduler_enabled"])
+    return settings_out
 
 
 @app.post("/settings/apify/token", response_model=SystemSettingsOut)
-async def update_apify_token(
+def update_apify_token(
     payload: ApifyTokenUpdate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_session),
 ) -> SystemSettingsOut:
-    settings = ensure_default_settings(db)
     token = (payload.token or "").strip()
-    settings.apify_api_token = token or None
-    db.commit()
-    db.refresh(settings)
+    settings = _write_settings(db, apify_api_token=token or None)
     monitor_service.clear_last_error()
     return _system_settings_out(settings)
 
 
 @app.delete("/settings/apify/token", response_model=SystemSettingsOut)
-async def clear_apify_token(db: Session = Depends(get_db)) -> SystemSettingsOut:
-    settings = ensure_default_settings(db)
-    settings.apify_api_token = None
-    db.commit()
-    db.refresh(settings)
+def clear_apify_token(db: Session = Depends(get_session)) -> SystemSettingsOut:
+    settings = _write_settings(db, apify_api_token=None)
     monitor_service.clear_last_error()
     return _system_settings_out(settings)
 
 
 @app.post("/settings/gemini/api-key", response_model=SystemSettingsOut)
-async def update_gemini_api_key(
+def update_gemini_api_key(
     payload: GeminiApiKeyUpdate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_session),
 ) -> SystemSettingsOut:
-    settings = ensure_default_settings(db)
-    settings.gemini_api_key = payload.api_key.strip()
-    db.commit()
-    db.refresh(settings)
+    settings = _write_settings(db, gemini_api_key=payload.api_key.strip())
     return _system_settings_out(settings)
 
 
 @app.delete("/settings/gemini/api-key", response_model=SystemSettingsOut)
-async def clear_gemini_api_key(db: Session = Depends(get_db)) -> SystemSettingsOut:
-    settings = ensure_default_settings(db)
-    settings.gemini_api_key = None
-    db.commit()
-    db.refresh(settings)
+def clear_gemini_api_key(db: Session = Depends(get_session)) -> SystemSettingsOut:
+    settings = _write_settings(db, gemini_api_key=None)
     return _system_settings_out(settings)
 
 
 @app.post("/apify/test", response_model=ApifyTestResponse)
-async def run_apify_test(
+def run_apify_test(
     payload: ApifyTestRequest,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_session),
 ) -> ApifyTestResponse:
-    settings = ensure_default_settings(db)
+    settings = settings_cache.get(db)
     target_url = (payload.url or "").strip()
     if not target_url:
         raise HTTPException(status_code=400, detail="Instagram URL or username is required")
@@ -500,12 +666,12 @@ async def run_apify_test(
 
 
 @app.get("/apify/run/{run_id}", response_model=ApifyTestResponse)
-async def fetch_apify_run(
+def fetch_apify_run(
     run_id: str,
     limit: int = 10,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_session),
 ) -> ApifyTestResponse:
-    settings = ensure_default_settings(db)
+    settings = settings_cache.get(db)
     try:
         return ApifyTestResponse(
             **monitor_service.fetch_apify_run_snapshot(settings, run_id, limit=limit)
@@ -516,12 +682,12 @@ async def fetch_apify_run(
 
 
 @app.post("/apify/run/{run_id}/import", response_model=ApifyImportStats)
-async def import_apify_run(
+def import_apify_run(
     run_id: str,
     limit: int = 10,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_session),
 ) -> ApifyImportStats:
-    settings = ensure_default_settings(db)
+    settings = settings_cache.get(db)
     try:
         snapshot = monitor_service.fetch_apify_run_snapshot(settings, run_id, limit=limit)
         stats = monitor_service.import_apify_posts(db, settings, snapshot["posts"])
@@ -534,63 +700,74 @@ async def import_apify_run(
         raise HTTPException(status_code=504, detail=detail)
 
 
+# 503 details per fetch mode; the single-club and all-clubs fetches word them differently
+# and the frontend shows them as-is.
+CLUB_FETCHER_NOT_READY = {
+    "instaloader": "Instaloader session is not available. Upload a session file or switch fetcher.",
+    "apify": "Apify integration is not configured. Add a personal API token and actor ID before using Apify mode.",
+    "auto": "No Instagram fetcher is ready. Provide an Instaloader session or Apify credentials.",
+}
+BULK_FETCHER_NOT_READY = {
+    "instaloader": "Instaloader session is not available. Upload a session file or switch to Apify mode.",
+    "apify": "Apify integration is not configured. Add a personal API token before using Apify mode.",
+}
+
+
+def _ensure_fetcher_ready(settings, details: Dict[str, str]) -> None:
+    """Fail with 503 if the configured fetcher cannot run; modes missing from ``details`` pass."""
+    fetch_mode = monitor_service._get_fetch_mode(settings)
+    apify_ready = bool(settings.has_apify_token and settings.apify_actor_id)
+    has_loader = bool(monitor_service.loader)
+
+    if fetch_mode == "instaloader":
+        ready = has_loader
+    elif fetch_mode == "apify":
+        ready = apify_ready
+    else:
+        ready = has_loader or apify_ready
+    if not ready and fetch_mode in details:
+        raise HTTPException(status_code=503, detail=details[fetch_mode])
+
+
 @app.post("/clubs/{club_id}/fetch-latest", response_model=ClubFetchLatestResponse)
 async def fetch_latest_for_club(
     club_id: int,
     post_count: int = 1,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_session),
 ) -> ClubFetchLatestResponse:
     if post_count < 1:
         raise HTTPException(status_code=400, detail="post_count must be at least 1")
 
-    club = db.query(Club).filter(Club.id == club_id).one_or_none()
+    club = await asyncio.to_thread(db.get, Club, club_id)
     if not club:
         raise HTTPException(status_code=404, detail="Club not found")
 
-    settings = ensure_default_settings(db)
-    fetch_mode = monitor_service._get_fetch_mode(settings)
-    apify_ready = bool(settings.apify_api_token and settings.apify_actor_id)
-    has_loader = bool(monitor_service.loader)
-
-    if fetch_mode == "instaloader" and not has_loader:
-        raise HTTPException(
-            status_code=503,
-            detail="Instaloader session is not available. Upload a session file or switch fetcher.",
-        )
-    if fetch_mode == "apify" and not apify_ready:
-        raise HTTPException(
-            status_code=503,
-            detail="Apify integration is not configured. Add a personal API token and actor ID before using Apify mode.",
-        )
-    if fetch_mode == "auto" and not has_loader and not apify_ready:
-        raise HTTPException(
-            status_code=503,
-            detail="No Instagram fetcher is ready. Provide an Instaloader session or Apify credentials.",
-        )
+    settings = await asyncio.to_thread(settings_cache.get, db)
+    _ensure_fetcher_ready(settings, CLUB_FETCHER_NOT_READY)
 
     try:
         async with monitor_service.run_guard("manual"):
-            stats = monitor_service.fetch_latest_posts_for_club(db, club, post_count, settings)
+            stats = await asyncio.to_thread(
+                monitor_service.fetch_latest_posts_for_club, db, club, post_count, settings
+            )
     except RateLimitError as exc:
-        db.rollback()
+        await asyncio.to_thread(db.rollback)
         detail = str(exc) or "Instagram temporarily blocked our requests. Please try again later."
         raise HTTPException(status_code=429, detail=detail)
     except ApifyIntegrationError as exc:
-        db.rollback()
+        await asyncio.to_thread(db.rollback)
         detail = str(exc) or "Apify integration failed to return results."
         raise HTTPException(status_code=502, detail=detail)
     except ApifyRunTimeoutError as exc:
-        db.rollback()
+        await asyncio.to_thread(db.rollback)
         detail = str(exc) or "Apify run timed out before completion."
         raise HTTPException(status_code=504, detail=detail)
     except HTTPException:
-        db.rollback()
+        await asyncio.to_thread(db.rollback)
         raise
     except Exception as exc:
-        db.rollback()
-        import traceback
-
-        print(f"Error in fetch_latest_for_club: {traceback.format_exc()}")
+        await asyncio.to_thread(db.rollback)
+        logger.exception("Error in fetch_latest_for_club")
         raise HTTPException(status_code=500, detail=f"Error fetching posts: {exc}")
 
     return ClubFetchLatestResponse(
@@ -604,11 +781,11 @@ async def fetch_latest_for_club(
 
 
 @app.post("/settings/session", response_model=SystemSettingsOut)
-async def upload_instagram_session(
+def upload_instagram_session(
     username: str = Form(...),
     file: Optional[UploadFile] = File(None),
     session_cookie: Optional[str] = Form(None),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_session),
 ) -> SystemSettingsOut:
     if not monitor_service.loader:
         raise HTTPException(status_code=503, detail="Instaloader is not available on this server")
@@ -626,12 +803,14 @@ async def upload_instagram_session(
                 raise HTTPException(status_code=400, detail="Session cookie must include a 'sessionid' value")
             monitor_service.save_session_from_cookies(username, cookies)
         elif file is not None:
-            content = await file.read()
-            if not content:
+            first_chunk = file.file.read(BACKUP_CHUNK_SIZE)
+            if not first_chunk:
                 raise HTTPException(status_code=400, detail="Session file was empty")
 
             INSTALOADER_SESSION_PATH.parent.mkdir(parents=True, exist_ok=True)
-            INSTALOADER_SESSION_PATH.write_bytes(content)
+            with INSTALOADER_SESSION_PATH.open("wb") as session_out:
+                session_out.write(first_chunk)
+                shutil.copyfileobj(file.file, session_out, length=BACKUP_CHUNK_SIZE)
         else:
             raise HTTPException(status_code=400, detail="Provide a session file or paste a session cookie string")
     except HTTPException:
@@ -656,31 +835,32 @@ async def upload_instagram_session(
         raise HTTPException(status_code=400, detail=f"Failed to load session: {exc}")
 
     db.commit()
-    db.refresh(settings)
+    settings_cache.invalidate()
     monitor_service.clear_last_error()
     return _system_settings_out(settings)
 
 
 @app.delete("/settings/session", response_model=SystemSettingsOut)
-async def remove_instagram_session(db: Session = Depends(get_db)) -> SystemSettingsOut:
-    settings = ensure_default_settings(db)
+def remove_instagram_session(db: Session = Depends(get_session)) -> SystemSettingsOut:
     monitor_service.remove_session()
     monitor_service.clear_backoff()
-    settings.instaloader_username = None
-    settings.instaloader_session_uploaded_at = None
-    db.commit()
-    db.refresh(settings)
+    settings = _write_settings(db, instaloader_username=None, instaloader_session_uploaded_at=None)
     monitor_service.clear_last_error()
     return _system_settings_out(settings)
 
 
 @app.post("/monitor/fetch-latest")
-async def fetch_latest_posts(post_count: int = 3, db: Session = Depends(get_db)) -> dict:
+async def fetch_latest_posts(
+    post_count: int = 3,
+    db: Session = Depends(get_session),
+) -> dict:
     """Manually fetch the latest N posts from all active clubs"""
     try:
         # Check if there are any active clubs first
-        active_clubs_count = db.query(Club).filter(Club.active.is_(True)).count()
-        if active_clubs_count == 0:
+        has_active_clubs = await asyncio.to_thread(
+            db.query(db.query(Club.id).filter(Club.active.is_(True)).exists()).scalar
+        )
+        if not has_active_clubs:
             return {
                 "success": False,
                 "message": "No active clubs found",
@@ -688,24 +868,11 @@ async def fetch_latest_posts(post_count: int = 3, db: Session = Depends(get_db))
                 "error": "Please activate some clubs in the Setup tab before fetching posts."
             }
 
-        settings = ensure_default_settings(db)
-        fetch_mode = monitor_service._get_fetch_mode(settings)
-        apify_ready = bool(settings.apify_api_token and settings.apify_actor_id)
-        has_loader = bool(monitor_service.loader)
-
-        if fetch_mode == "instaloader" and not has_loader:
-            raise HTTPException(
-                status_code=503,
-                detail="Instaloader session is not available. Upload a session file or switch to Apify mode."
-            )
-        if fetch_mode == "apify" and not apify_ready:
-            raise HTTPException(
-                status_code=503,
-                detail="Apify integration is not configured. Add a personal API token before using Apify mode."
-            )
+        settings = await asyncio.to_thread(settings_cache.get, db)
+        _ensure_fetcher_ready(settings, BULK_FETCHER_NOT_READY)
 
         async with monitor_service.run_guard("manual"):
-            stats = monitor_service.fetch_latest_posts_for_clubs(db, post_count)
+            stats = await asyncio.to_thread(monitor_service.fetch_latest_posts_for_clubs, db, post_count)
         return {
             "success": True,
             "message": f"Successfully fetched posts from {stats['clubs']} clubs",
@@ -723,35 +890,62 @@ async def fetch_latest_posts(post_count: int = 3, db: Session = Depends(get_db))
     except HTTPException:
         raise
     except Exception as e:
-        import traceback
         error_detail = f"Error fetching posts: {str(e)}"
-        print(f"Error in fetch_latest_posts: {traceback.format_exc()}")
+        logger.exception("Error in fetch_latest_posts")
         raise HTTPException(status_code=500, detail=error_detail)
 
 
+def _store_club_posts(
+    db: Session,
+    club: Club,
+    posts: List[Dict],
+    auto_classify: bool,
+    settings,
+    known_ids,
+    checked_at: datetime,
+) -> int:
+    """Save one club's posts and mark it checked in a single commit.
+
+    The stream commits club by club: a client disconnect cancels the generator at its
+    next ``yield``, so anything left for after the loop would be rolled back.
+    """
+    created = monitor_service._create_posts_if_new(db, club, posts, auto_classify, settings, known_ids)
+    monitor_service._mark_clubs_checked(db, [club.id], checked_at)
+    db.commit()
+    return created
+
+
 @app.post("/monitor/fetch-latest-stream")
-async def fetch_latest_posts_stream(post_count: int = 3, db: Session = Depends(get_db)):
+async def fetch_latest_posts_stream(request: Request, post_count: int = 3, db: Session = Depends(get_session)):
     """Stream real-time progress while fetching latest posts"""
-    import json
 
     async def generate_progress():
+        # A club's completion frame is held back and written together with the next
+        # frame, so each club costs a single write to the client.
+        pending: List[bytes] = []
         try:
             # Check if there are any active clubs first
-            active_clubs_count = db.query(Club).filter(Club.active.is_(True)).count()
+            clubs = await asyncio.to_thread(
+                db.query(Club)
+                .options(load_only(Club.id, Club.username, Club.name, Club.classification_mode))
+                .filter(Club.active.is_(True))
+                .all
+            )
+            active_clubs_count = len(clubs)
             if active_clubs_count == 0:
-                yield f"data: {json.dumps({'error': 'No active clubs found'})}\n\n"
+                yield SSE_NO_ACTIVE_CLUBS
                 return
 
-            settings = ensure_default_settings(db)
+            settings = await asyncio.to_thread(settings_cache.get, db)
             fetch_mode = monitor_service._get_fetch_mode(settings)
-            apify_ready = bool(settings.apify_api_token and settings.apify_actor_id)
+            apify_ready = bool(settings.has_apify_token and settings.apify_actor_id)
             has_loader = bool(monitor_service.loader)
 
             if fetch_mode == "instaloader" and not has_loader:
-                yield f"data: {json.dumps({'error': 'Instaloader session is not available'})}\n\n"
+                yield SSE_INSTALOADER_UNAVAILABLE
                 return
             if fetch_mode == "apify" and not apify_ready:
-                yield f"data: {json.dumps({'error': 'Apify integration is not configured'})}\n\n"
+                yield SSE_APIFY_NOT_CONFIGURED
                 return
 
             async with monitor_service.run_guard("manual"):
@@ -763,118 +957,139 @@ async def fetch_latest_posts_stream(post_count: int = 3, db: Session = Depends(g
                             monitor_service.next_run_eta_seconds
                             or monitor_service.rate_limit_backoff_minutes * 60
                         )
-                        yield f"data: {json.dumps({'status': 'error', 'error': f'Instagram is throttling requests. Please retry in {max(wait_seconds // 60, 1)} minutes.'})}\n\n"
+                        yield _sse({'status': 'error', 'error': f'Instagram is throttling requests. Please retry in {max(wait_seconds // 60, 1)} minutes.'})
                         return
 
-                yield f"data: {json.dumps({'status': 'starting', 'message': f'Starting to fetch {post_count} posts from {active_clubs_count} clubs'})}\n\n"
+                yield SSE_STARTING_TEMPLATE % orjson.dumps(f'Starting to fetch {post_count} posts from {active_clubs_count} clubs')
 
                 stats = {"clubs": 0, "posts": 0, "classified": 0}
-                monitor_service._last_run = datetime.utcnow()
+                run_started = monitor_service._last_run = datetime.utcnow()
 
                 global_auto = (settings.classification_mode or ClassificationModeEnum.MANUAL).lower() == ClassificationModeEnum.AUTO
 
-                clubs = db.query(Club).filter(Club.active.is_(True)).all()
-                total_clubs = len(clubs)
+                total_clubs = active_clubs_count
 
                 apify_bulk_cache: Dict[str, List[Dict]] = {}
-                apify_known_map: Dict[str, Set[str]] = {}
+                known_map = await asyncio.to_thread(monitor_service._get_known_post_map, db, clubs)
                 if fetch_mode == "apify":
                     apify_client = monitor_service._get_apify_client(settings)
                     if not apify_client:
-                        yield f"data: {json.dumps({'status': 'error', 'error': 'Apify integration is not configured.'})}\n\n"
+                        yield SSE_APIFY_CLIENT_UNAVAILABLE
                         return
-                    apify_known_map = {
-                        club.username: monitor_service._get_recent_post_ids(db, club.id)
-                        for club in clubs
-                    }
                     configured_limit = settings.apify_results_limit or post_count
                     limit = max(1, min(configured_limit, post_count))
                     try:
-                        apify_bulk_cache = monitor_service._collect_posts_via_apify_bulk(
-                            apify_client,
-                            [club.username for club in clubs],
-                            limit,
-                            apify_known_map,
+                        bulk_task = asyncio.ensure_future(
+                            asyncio.to_thread(
+                                monitor_service._collect_posts_via_apify_bulk,
+                                apify_client,
+                                [club.username for club in clubs],
+                                limit,
+                                known_map,
+                            )
                         )
+                        async for heartbeat in _sse_heartbeats(bulk_task):
+                            yield heartbeat
+                        apify_bulk_cache = bulk_task.result()
                     except ApifyIntegrationError as exc:
-                        yield f"data: {json.dumps({'status': 'error', 'error': str(exc) or 'Apify integration failed to return results.'})}\n\n"
+                        yield _sse({'status': 'error', 'error': str(exc) or 'Apify integration failed to return results.'})
                         return
 
                 for i, club in enumerate(clubs, 1):
-                    yield f"data: {json.dumps({'status': 'processing', 'current_club': club.username, 'progress': i, 'total': total_clubs, 'message': f'Processing {club.name} ({i}/{total_clubs})'})}\n\n"
+                    # Frames are only produced as fast as the client takes them, but the
+                    # fetches behind them are not free: stop at a club boundary once the
+                    # client has gone and keep what was already collected.
+                    if await request.is_disconnected():
+                        logger.info("Fetch stream client disconnected after %s of %s clubs", i - 1, total_clubs)
+                        break
+                    pending.append(
+                        SSE_PROCESSING_TEMPLATE
+                        % (orjson.dumps(club.username), i, total_clubs, orjson.dumps(f'Processing {club.name} ({i}/{total_clubs})'))
+                    )
+                    yield b"".join(pending)
+                    pending.clear()
 
                     stats["clubs"] += 1
+                    known_ids = known_map.get(club.username, set())
                     try:
                         if fetch_mode == "apify":
-                            known_ids = apify_known_map.get(club.username, set())
                             posts = apify_bulk_cache.get(club.username, [])
                         else:
-                            known_ids = monitor_service._get_recent_post_ids(db, club.id)
-                            posts = monitor_service._fetch_latest_posts_for_club(
-                                settings,
-                                club.username,
-                                post_count,
-                                known_ids,
+                            fetch_task = asyncio.ensure_future(
+                                asyncio.to_thread(
+                                    monitor_service._fetch_latest_posts_for_club,
+                                    settings,
+                                    club.username,
+                                    post_count,
+                                    known_ids,
+                                )
                             )
+                            async for heartbeat in _sse_heartbeats(fetch_task):
+                                yield heartbeat
+                            posts = fetch_task.result()
                     except RateLimitError as exc:
-                        db.rollback()
+                        await asyncio.to_thread(db.rollback)
                         monitor_service.set_last_error(str(exc))
                         monitor_service._schedule_backoff()
-                        yield f"data: {json.dumps({'status': 'error', 'error': str(exc) or 'Instagram temporarily blocked our requests. Please try again later.'})}\n\n"
+                        yield _sse({'status': 'error', 'error': str(exc) or 'Instagram temporarily blocked our requests. Please try again later.'})
                         return
                     except ApifyIntegrationError as exc:
-                        db.rollback()
+                        await asyncio.to_thread(db.rollback)
                         monitor_service.set_last_error(str(exc))
-                        yield f"data: {json.dumps({'status': 'error', 'error': str(exc) or 'Apify integration failed to return results.'})}\n\n"
+                        yield _sse({'status': 'error', 'error': str(exc) or 'Apify integration failed to return results.'})
                         return
                     except ApifyRunTimeoutError as exc:
-                        db.rollback()
-                        monitor_service.set_last_error(str(exc))
-                        yield f"data: {json.dumps({'status': 'error', 'error': str(exc) or 'Apify run timed out before completion.'})}\n\n"
-                        return
-                    except ApifyIntegrationError as exc:
-                        db.rollback()
+                        await asyncio.to_thread(db.rollback)
                         monitor_service.set_last_error(str(exc))
-                        yield f"data: {json.dumps({'status': 'error', 'error': str(exc) or 'Apify integration failed to return results.'})}\n\n"
+                        yield _sse({'status': 'error', 'error': str(exc) or 'Apify run timed out before completion.'})
                         return
 
-                    for post in posts:
-                        auto_classify = global_auto and (club.classification_mode or ClassificationModeEnum.MANUAL).lower() == ClassificationModeEnum.AUTO
-                        if monitor_service._create_post_if_new(db, club, post, auto_classify, settings):
-                            stats["posts"] += 1
-                            if auto_classify:
-                                stats["classified"] += 1
+                    auto_classify = global_auto and (club.classification_mode or ClassificationModeEnum.MANUAL).lower() == ClassificationModeEnum.AUTO
+                    created = await asyncio.to_thread(
+                        _store_club_posts, db, club, posts, auto_classify, settings, known_ids, run_started
+                    )
+                    stats["posts"] += created
+                    if auto_classify:
+                        stats["classified"] += created
 
-                    club.last_checked = datetime.utcnow()
-                    yield f"data: {json.dumps({'status': 'completed_club', 'club': club.username, 'posts_found': len(posts), 'progress': i, 'total': total_clubs})}\n\n"
-                    monitor_service._apply_delay(settings.club_fetch_delay_seconds)
+                    pending.append(
+                        SSE_COMPLETED_CLUB_TEMPLATE % (orjson.dumps(club.username), len(posts), i, total_clubs)
+                    )
+                    await asyncio.to_thread(monitor_service._apply_delay, settings.club_fetch_delay_seconds)
 
-                db.commit()
                 clubs_count = stats["clubs"]
                 completion_message = f'Successfully fetched posts from {clubs_count} clubs'
                 monitor_service.clear_last_error()
-                yield f"data: {json.dumps({'status': 'completed', 'message': completion_message, 'stats': stats})}\n\n"
+                pending.append(_sse({'status': 'completed', 'message': completion_message, 'stats': stats}))
+                yield b"".join(pending)
 
         except Exception as e:
-            import traceback
             error_detail = f"Error fetching posts: {str(e)}"
-            print(f"Error in fetch_latest_posts_stream: {traceback.format_exc()}")
-            yield f"data: {json.dumps({'status': 'error', 'error': error_detail})}\n\n"
-
-    return StreamingResponse(generate_progress(), media_type="text/plain")
+            logger.exception("Error in fetch_latest_posts_stream")
+            pending.append(_sse({'status': 'error', 'error': error_detail}))
+            yield b"".join(pending)
+
+    return StreamingResponse(
+        generate_progress(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 
 
 
 @app.get("/clubs", response_model=List[ClubOut])
-async def list_clubs(db: Session = Depends(get_db)) -> List[ClubOut]:
-    clubs = db.query(Club).order_by(Club.name.asc()).all()
-    return clubs
+def list_clubs(limit: Optional[int] = None, db: Session = Depends(get_session)) -> List[ClubOut]:
+    stmt = lambda_stmt(lambda: select(Club).order_by(Club.name.asc()))
+    if limit is not None:
+        bounded_limit = max(1, limit)
+        stmt += lambda s: s.limit(bounded_limit)
+    return db.execute(stmt).scalars().all()
 
 
 @app.patch("/clubs/{club_id}", response_model=ClubOut)
-async def update_club(club_id: int, payload: ClubUpdate, db: Session = Depends(get_db)) -> ClubOut:
+def update_club(club_id: int, payload: ClubUpdate, db: Session = Depends(get_session)) -> ClubOut:
     club = db.query(Club).filter(Club.id == club_id).one_or_none()
     if not club:
         raise HTTPException(status_code=404, detail="Club not found")
@@ -885,66 +1100,120 @@ async def update_club(club_id: int, payload: ClubUpdate, db: Session = Depends(g
     if payload.classification_mode is not None:
         club.classification_mode = payload.classification_mode
     db.commit()
-    db.refresh(club)
     return club
 
 
 @app.post("/clubs/import", response_model=CSVImportResponse)
-async def import_clubs(file: UploadFile = File(...), db: Session = Depends(get_db)) -> CSVImportResponse:
+def import_clubs(file: UploadFile = File(...), db: Session = Depends(get_session)) -> CSVImportResponse:
     if not file.filename.lower().endswith(".csv"):
         raise HTTPException(status_code=400, detail="Only CSV files are supported")
-    content = (await file.read()).decode("utf-8")
-    created, updated = import_clubs_from_csv(db, content)
+    text_stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        created, updated = import_clubs_from_csv(db, text_stream)
+    finally:
+        # Leave closing the spooled upload to UploadFile.
+        text_stream.detach()
     return CSVImportResponse(clubs_created=created, clubs_updated=updated)
 
 
-@app.get("/posts", response_model=List[PostOut])
-async def list_posts(status: Optional[str] = None, db: Session = Depends(get_db)) -> List[PostOut]:
-    query = db.query(Post).options(joinedload(Post.club)).order_by(Post.post_timestamp.desc())
+POSTS_PAGE_SIZE = 200
+
+
+def _parse_posts_cursor(cursor: str) -> tuple[datetime, int]:
+    """Split a ``<post_timestamp>,<id>`` cursor as emitted in ``X-Next-Cursor``."""
+    timestamp, _, post_id = cursor.rpartition(",")
+    try:
+        return datetime.fromisoformat(timestamp), int(post_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from None
+
+
+@app.get(
+    "/posts",
+    response_model=List[PostOut],
+    response_class=ORJSONResponse,
+    responses={
+        200: {
+            "headers": {
+                NEXT_CURSOR_HEADER: {
+                    "description": "Cursor for the next (older) page; only sent when this page is full.",
+                    "schema": {"type": "string"},
+                }
+            }
+        }
+    },
+)
+def list_posts(
+    response: Response,
+    status: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = POSTS_PAGE_SIZE,
+    db: Session = Depends(get_session),
+) -> List[PostOut]:
+    # Keyset pagination: a full page carries an ``X-Next-Cursor`` header; pass it back as
+    # ``cursor`` for the next (older) page without the database counting past an OFFSET.
+    # The id breaks ties so posts sharing a timestamp are never skipped at a page boundary.
+    bounded_limit = max(1, min(limit, POSTS_PAGE_SIZE))
+    stmt = lambda_stmt(
+        lambda: select(Post)
+        .options(selectinload(Post.club), selectinload(Post.extracted_event))
+        .order_by(Post.post_timestamp.desc(), Post.id.desc())
+        .limit(bounded_limit)
+    )
+    if cursor is not None:
+        cursor_timestamp, cursor_id = _parse_posts_cursor(cursor)
+        stmt += lambda s: s.where(tuple_(Post.post_timestamp, Post.id) < tuple_(cursor_timestamp, cursor_id))
     if status == "pending":
-        query = query.filter(Post.is_event_poster.is_(None))
+        stmt += lambda s: s.where(Post.is_event_poster.is_(None))
     elif status == "events":
-        query = query.filter(Post.is_event_poster.is_(True))
+        stmt += lambda s: s.where(Post.is_event_poster.is_(True))
     elif status == "non_events":
-        query = query.filter(Post.is_event_poster.is_(False))
-    posts = query.limit(200).all()
+        stmt += lambda s: s.where(Post.is_event_poster.is_(False))
+    posts = db.execute(stmt).scalars().all()
+    if len(posts) == bounded_limit:
+        last = posts[-1]
+        response.headers[NEXT_CURSOR_HEADER] = f"{last.post_timestamp},{last.id}"
     return posts
 
 
+# Single-post endpoints return PostOut, which serializes the club and extracted event.
+# Load them the same way /posts does: the post, then one SELECT ... IN per relationship
+# (three queries up front instead of lazy loads during serialization).
+POST_OUT_LOAD = (selectinload(Post.club), selectinload(Post.extracted_event))
+
+
 @app.post("/posts/{post_id}/classify", response_model=PostOut)
-async def classify_post(
+def classify_post(
     post_id: int,
     payload: PostClassificationRequest,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_session),
 ) -> PostOut:
-    post = db.query(Post).options(joinedload(Post.club)).filter(Post.id == post_id).one_or_none()
+    post = db.get(Post, post_id, options=POST_OUT_LOAD)
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
-    settings = ensure_default_settings(db)
+    settings = settings_cache.get(db)
     post.is_event_poster = payload.is_event_poster
     post.classification_confidence = payload.confidence
     post.manual_review_notes = payload.notes
 
     should_schedule_auto_extract = False
     if payload.is_event_poster and settings.gemini_auto_extract:
-        gemini_api_key = (settings.gemini_api_key or "").strip() or os.getenv("GEMINI_API_KEY", "").strip()
-        if gemini_api_key and not post.extracted_event:
+        if resolve_gemini_api_key(settings) and not post.extracted_event:
             should_schedule_auto_extract = True
     db.commit()
-    db.refresh(post)
     if should_schedule_auto_extract:
         background_tasks.add_task(_run_gemini_auto_extract, post.id)
     return post
 
 
 @app.post("/posts/{post_id}/events", response_model=PostOut)
-async def attach_event(
+def attach_event(
     post_id: int,
     payload: EventExtractionRequest,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_session),
 ) -> PostOut:
-    post = db.query(Post).options(joinedload(Post.club)).filter(Post.id == post_id).one_or_none()
+    post = db.get(Post, post_id, options=POST_OUT_LOAD)
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
     if not payload.event_data:
@@ -960,22 +1229,16 @@ async def attach_event(
         )
     post.processed = True
     db.commit()
-    db.refresh(post)
     return post
 
 
 @app.post("/posts/{post_id}/extract", response_model=PostOut)
-async def extract_event_with_gemini(
+def extract_event_with_gemini(
     post_id: int,
     overwrite: bool = True,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_session),
 ) -> PostOut:
-    post = (
-        db.query(Post)
-        .options(joinedload(Post.club), joinedload(Post.extracted_event))
-        .filter(Post.id == post_id)
-        .one_or_none()
-    )
+    post = db.get(Post, post_id, options=POST_OUT_LOAD)
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
 
@@ -985,8 +1248,8 @@ async def extract_event_with_gemini(
     if post.extracted_event and not overwrite:
         raise HTTPException(status_code=409, detail="Event data already exists for this post")
 
-    settings = ensure_default_settings(db)
-    api_key = (settings.gemini_api_key or "").strip() or os.getenv("GEMINI_API_KEY", "").strip()
+    settings = settings_cache.get(db)
+    api_key = resolve_gemini_api_key(settings)
     if not api_key:
         raise HTTPException(status_code=400, detail="Gemini API key is not configured")
 
@@ -1002,16 +1265,7 @@ async def extract_event_with_gemini(
     if downloaded_filename and downloaded_filename != post.local_image_path:
         post.local_image_path = downloaded_filename
 
-    extraction_confidence = None
-    payload_confidence = None
-    if isinstance(payload, dict):
-        payload_confidence = payload.get("extractionConfidence")
-    if isinstance(payload_confidence, dict):
-        overall = payload_confidence.get("overall")
-        try:
-            extraction_confidence = float(overall) if overall is not None else None
-        except (TypeError, ValueError):
-            extraction_confidence = None
+    extraction_confidence = extraction_confidence_from_payload(payload)
 
     if post.extracted_event:
         post.extracted_event.event_data_json = payload
@@ -1025,13 +1279,12 @@ async def extract_event_with_gemini(
 
     post.processed = True
     db.commit()
-    db.refresh(post)
     return post
 
 
 @app.delete("/posts/{post_id}", response_model=DeletePostResponse)
-async def delete_post(post_id: int, db: Session = Depends(get_db)) -> DeletePostResponse:
-    post = db.query(Post).filter(Post.id == post_id).one_or_none()
+def delete_post(post_id: int, db: Session = Depends(get_session)) -> DeletePostResponse:
+    post = db.get(Post, post_id)
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
     db.delete(post)
@@ -1040,65 +1293,132 @@ async def delete_post(post_id: int, db: Session = Depends(get_db)) -> DeletePost
 
 
 @app.get("/stats", response_model=StatsOut)
-async def stats(db: Session = Depends(get_db)) -> StatsOut:
-    total_clubs = db.query(Club).count()
-    active_clubs = db.query(Club).filter(Club.active.is_(True)).count()
-    pending_posts = db.query(Post).filter(Post.is_event_poster.is_(None)).count()
-    event_posts = db.query(Post).filter(Post.is_event_poster.is_(True)).count()
-    processed_events = db.query(ExtractedEvent).count()
-    return StatsOut(
-        total_clubs=total_clubs,
-        active_clubs=active_clubs,
-        pending_posts=pending_posts,
-        event_posts=event_posts,
-        processed_events=processed_events,
-    )
+def stats(db: Session = Depends(get_session)) -> StatsOut:
+    # One aggregate per table, cross-joined so every count comes back in a single row.
+    club_counts = select(
+        func.count(Club.id).label("total_clubs"),
+        func.count(Club.id).filter(Club.active.is_(True)).label("active_clubs"),
+    ).subquery()
+    post_counts = select(
+        func.count(Post.id).filter(Post.is_event_poster.is_(None)).label("pending_posts"),
+        func.count(Post.id).filter(Post.is_event_poster.is_(True)).label("event_posts"),
+    ).subquery()
+    event_counts = select(func.count(ExtractedEvent.id).label("processed_events")).subquery()
+    row = db.execute(
+        select(club_counts, post_counts, event_counts).select_from(
+            club_counts.join(post_counts, true()).join(event_counts, true())
+        )
+    ).one()
+    return StatsOut(**row._mapping)
 
 
-@app.get("/events/export", response_model=List[ClubEventsExport])
-async def export_events(db: Session = Depends(get_db)) -> List[ClubEventsExport]:
+# Rows hydrated per fetch when walking every extracted event.
+EXPORT_BATCH_SIZE = 500
+
+
+def _iter_club_exports(db: Session) -> Iterator[Dict[str, Any]]:
+    """Yield one export entry per club, each complete before the next club's rows are read.
+
+    Entries are plain dicts handed straight to orjson: the payloads are free-form JSON
+    that Pydantic would otherwise validate and walk a second time on the way out.
+    """
     extracted_events = (
         db.query(ExtractedEvent)
         .join(Post)
         .join(Club)
-        .options(joinedload(ExtractedEvent.post).joinedload(Post.club))
-        .order_by(Club.name.asc(), ExtractedEvent.created_at.desc())
-        .all()
+        # Populate post and club from the joins above instead of joining them a second time.
+        .options(contains_eager(ExtractedEvent.post).contains_eager(Post.club), raiseload("*"))
+        # Club.id keeps clubs that share a name from interleaving.
+        .order_by(Club.name.asc(), Club.id.asc(), ExtractedEvent.created_at.desc())
+        .yield_per(EXPORT_BATCH_SIZE)
     )
 
-    clubs: Dict[int, ClubEventsExport] = {}
+    wrapper: Optional[Dict[str, Any]] = None
     for extracted in extracted_events:
         post = extracted.post
         club = post.club
-        if club.id not in clubs:
-            clubs[club.id] = ClubEventsExport(
-                club_id=club.id,
-                club_name=club.name,
-                club_username=club.username,
-                club_profile_url=f"https://www.instagram.com/{club.username}/",
-                events=[],
-            )
-        wrapper = clubs[club.id]
-        post_url = f"https://www.instagram.com/p/{post.instagram_id}/"
+        if wrapper is None or wrapper["club_id"] != club.id:
+            if wrapper is not None:
+                yield wrapper
+            wrapper = {
+                "club_id": club.id,
+                "club_name": club.name,
+                "club_username": club.username,
+                "club_profile_url": f"https://www.instagram.com/{club.username}/",
+                "platform": "instagram",
+                "events": [],
+            }
         image_url = None
         if post.local_image_path:
             image_url = get_image_url(post.local_image_path)
         elif post.image_url:
             image_url = post.image_url
-        event_item = EventExportItem(
-            db_id=f"event:{extracted.id}",
-            post_id=post.id,
-            post_instagram_id=post.instagram_id,
-            post_url=post_url,
-            post_timestamp=post.post_timestamp.isoformat() if isinstance(post.post_timestamp, datetime) else str(post.post_timestamp),
-            post_caption=post.caption,
-            post_image_url=image_url,
-            payload=extracted.event_data_json,
-            extraction_confidence=extracted.extraction_confidence,
+        wrapper["events"].append(
+            {
+                "db_id": f"event:{extracted.id}",
+                "post_id": post.id,
+                "post_instagram_id": post.instagram_id,
+                "post_url": f"https://www.instagram.com/p/{post.instagram_id}/",
+                "post_timestamp": post.post_timestamp.isoformat() if isinstance(post.post_timestamp, datetime) else str(post.post_timestamp),
+                "post_caption": post.caption,
+                "post_image_url": image_url,
+                "payload": extracted.event_data_json,
+                "extraction_confidence": extracted.extraction_confidence,
+            }
         )
-        wrapper.events.append(event_item)
+    if wrapper is not None:
+        yield wrapper
+
+
+def _iter_club_exports_json() -> Iterator[bytes]:
+    # Writes the same JSON array the endpoint always returned, one club at a time.
+    # The generator outlives the request's dependencies, so it owns its session.
+    session = SessionLocal()
+    try:
+        separator = b"["
+        for club_export in _iter_club_exports(session):
+            yield separator + orjson.dumps(club_export)
+            separator = b","
+        yield b"[]" if separator == b"[" else b"]"
+    finally:
+        session.close()
+
+
+# The exports stream from their own session, so FastAPI never sees the rows; the schema is
+# declared for the OpenAPI docs only.
+@app.get(
+    "/events/export",
+    response_class=StreamingResponse,
+    responses={200: {"model": List[ClubEventsExport], "content": {"application/json": {}}}},
+)
+def export_events() -> StreamingResponse:
+    return StreamingResponse(_iter_club_exports_json(), media_type="application/json")
+
+
+def _iter_club_exports_ndjson() -> Iterator[bytes]:
+    session = SessionLocal()
+    try:
+        for club_export in _iter_club_exports(session):
+            yield orjson.dumps(club_export) + b"\n"
+    finally:
+        session.close()
+
+
+@app.get(
+    "/events/export.ndjson",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "description": "One ClubEventsExport object per line.",
+            # The component itself is registered by /events/export.
+            "content": {"application/x-ndjson": {"schema": {"$ref": "#/components/schemas/ClubEventsExport"}}},
+        }
+    },
+)
+def export_events_ndjson() -> StreamingResponse:
+    """Same entries as ``/events/export``, one club per line, sent as each club is read."""
+    return StreamingResponse(_iter_club_exports_ndjson(), media_type="application/x-ndjson")
 
-    return list(clubs.values())
 
 def _render_status(settings) -> MonitorStatus:
     last_run = monitor_service.last_run.isoformat() if monitor_service.last_run else None
@@ -1147,8 +1467,8 @@ def _system_settings_out(settings) -> SystemSettingsOut:
         apify_enabled=bool(settings.apify_enabled),
         apify_actor_id=settings.apify_actor_id,
         apify_results_limit=settings.apify_results_limit,
-        has_apify_token=bool(getattr(settings, "apify_api_token", None)),
-        has_gemini_api_key=bool((settings.gemini_api_key or "").strip() or os.getenv("GEMINI_API_KEY")),
+        has_apify_token=bool(getattr(settings, "has_apify_token", False)),
+        has_gemini_api_key=bool(resolve_gemini_api_key(settings)),
         gemini_auto_extract=bool(getattr(settings, "gemini_auto_extract", False)),
         instagram_fetcher=monitor_service._get_fetch_mode(settings),
         scheduler_enabled=bool(getattr(settings, "scheduler_enabled", False)),
@@ -1157,8 +1477,17 @@ def _system_settings_out(settings) -> SystemSettingsOut:
     )
 
 
-def _scheduled_job_to_out(job: ScheduledJob) -> ScheduledJobOut:
-    aps_job = scheduler_service.scheduler.get_job(f"scheduler-job-{job.id}") if scheduler_service.scheduler else None
+def _aps_jobs_by_id() -> Dict[str, Any]:
+    scheduler = scheduler_service.scheduler
+    return {aps_job.id: aps_job for aps_job in scheduler.get_jobs()} if scheduler else {}
+
+
+def _scheduled_job_to_out(job: ScheduledJob, aps_jobs: Optional[Dict[str, Any]] = None) -> ScheduledJobOut:
+    aps_job_id = f"scheduler-job-{job.id}"
+    if aps_jobs is not None:
+        aps_job = aps_jobs.get(aps_job_id)
+    else:
+        aps_job = scheduler_service.scheduler.get_job(aps_job_id) if scheduler_service.scheduler else None
     next_run = getattr(aps_job, "next_run_time", None)
 
     return ScheduledJobOut(
@@ -1181,7 +1510,7 @@ def _scheduled_job_to_out(job: ScheduledJob) -> ScheduledJobOut:
 
 
 def _scheduled_run_to_out(run: ScheduledJobRun) -> ScheduledJobRunOut:
-    return ScheduledJobRunOut.from_orm(run)
+    return ScheduledJobRunOut.model_validate(run)
 
 
 def _get_scheduled_job_or_404(db: Session, job_id: int) -> ScheduledJob:
@@ -1191,20 +1520,39 @@ def _get_scheduled_job_or_404(db: Session, job_id: int) -> ScheduledJob:
     return job
 
 
+def _assert_scheduled_job_exists(db: Session, job_id: int) -> None:
+    # Only the id is selected, so the job row and its JSON payload are never hydrated.
+    if db.execute(select(ScheduledJob.id).where(ScheduledJob.id == job_id)).scalar() is None:
+        raise HTTPException(status_code=404, detail="Scheduled job not found")
+
+
+# The scheduler endpoints stay async for scheduler_service, so their session work
+# runs through asyncio.to_thread with these helpers.
+def _save_scheduled_job(db: Session, job: ScheduledJob) -> None:
+    db.add(job)
+    db.commit()
+
+
+def _delete_scheduled_job(db: Session, job: ScheduledJob) -> None:
+    db.delete(job)
+    db.commit()
+
+
 @app.get("/scheduler/jobs", response_model=List[ScheduledJobOut])
-async def list_scheduler_jobs(db: Session = Depends(get_db)) -> List[ScheduledJobOut]:
+def list_scheduler_jobs(db: Session = Depends(get_session)) -> List[ScheduledJobOut]:
     jobs = (
         db.query(ScheduledJob)
         .order_by(ScheduledJob.created_at.asc())
         .all()
     )
-    return [_scheduled_job_to_out(job) for job in jobs]
+    aps_jobs = _aps_jobs_by_id()
+    return [_scheduled_job_to_out(job, aps_jobs) for job in jobs]
 
 
 @app.post("/scheduler/jobs", response_model=ScheduledJobOut, status_code=201)
 async def create_scheduler_job(
     payload: ScheduledJobCreate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_session),
 ) -> ScheduledJobOut:
     try:
         scheduler_service.validate_schedule(
@@ -1228,15 +1576,13 @@ async def create_scheduler_job(
         skip_if_manual_running=payload.skip_if_manual_running,
         payload=payload.payload or {},
     )
-    db.add(job)
-    db.commit()
-    db.refresh(job)
+    await asyncio.to_thread(_save_scheduled_job, db, job)
     await scheduler_service.refresh_job(job.id)
     return _scheduled_job_to_out(job)
 
 
 @app.get("/scheduler/jobs/{job_id}", response_model=ScheduledJobOut)
-async def get_scheduler_job(job_id: int, db: Session = Depends(get_db)) -> ScheduledJobOut:
+def get_scheduler_job(job_id: int, db: Session = Depends(get_session)) -> ScheduledJobOut:
     job = _get_scheduled_job_or_404(db, job_id)
     return _scheduled_job_to_out(job)
 
@@ -1245,10 +1591,10 @@ async def get_scheduler_job(job_id: int, db: Session = Depends(get_db)) -> Sched
 async def update_scheduler_job(
     job_id: int,
     payload: ScheduledJobUpdate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_session),
 ) -> ScheduledJobOut:
-    job = _get_scheduled_job_or_404(db, job_id)
-    data = payload.dict(exclude_unset=True)
+    job = await asyncio.to_thread(_get_scheduled_job_or_404, db, job_id)
+    data = payload.model_dump(exclude_unset=True)
 
     schedule_type = data.get("schedule_type", job.schedule_type)
     timezone = data.get("timezone", job.timezone)
@@ -1285,40 +1631,37 @@ async def update_scheduler_job(
     if "payload" in data:
         job.payload = data["payload"] or {}
 
-    db.add(job)
-    db.commit()
-    db.refresh(job)
+    await asyncio.to_thread(_save_scheduled_job, db, job)
     await scheduler_service.refresh_job(job.id)
     return _scheduled_job_to_out(job)
 
 
 @app.delete("/scheduler/jobs/{job_id}", status_code=204)
-async def delete_scheduler_job(job_id: int, db: Session = Depends(get_db)):
-    job = _get_scheduled_job_or_404(db, job_id)
+async def delete_scheduler_job(job_id: int, db: Session = Depends(get_session)):
+    job = await asyncio.to_thread(_get_scheduled_job_or_404, db, job_id)
     await scheduler_service.remove_job(job.id)
-    db.delete(job)
-    db.commit()
+    await asyncio.to_thread(_delete_scheduled_job, db, job)
 
 
 @app.post("/scheduler/jobs/{job_id}/run", response_model=ScheduledJobRunDetail)
-async def trigger_scheduler_job(job_id: int, db: Session = Depends(get_db)) -> ScheduledJobRunDetail:
-    job = _get_scheduled_job_or_404(db, job_id)
+async def trigger_scheduler_job(job_id: int, db: Session = Depends(get_session)) -> ScheduledJobRunDetail:
+    job = await asyncio.to_thread(_get_scheduled_job_or_404, db, job_id)
     run_id = await scheduler_service.run_job_now(job.id)
     if not run_id:
         raise HTTPException(status_code=500, detail="Failed to start job run")
-    run = db.query(ScheduledJobRun).filter(ScheduledJobRun.id == run_id).one_or_none()
+    run = await asyncio.to_thread(db.get, ScheduledJobRun, run_id)
     if not run:
         raise HTTPException(status_code=404, detail="Job run not found")
-    return ScheduledJobRunDetail.from_orm(run)
+    return ScheduledJobRunDetail.model_validate(run)
 
 
 @app.get("/scheduler/jobs/{job_id}/runs", response_model=List[ScheduledJobRunOut])
-async def list_scheduler_job_runs(
+def list_scheduler_job_runs(
     job_id: int,
     limit: int = 25,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_session),
 ) -> List[ScheduledJobRunOut]:
-    _ = _get_scheduled_job_or_404(db, job_id)
+    _assert_scheduled_job_exists(db, job_id)
     bounded_limit = max(1, min(limit, 200))
     runs = (
         db.query(ScheduledJobRun)
@@ -1331,12 +1674,12 @@ async def list_scheduler_job_runs(
 
 
 @app.get("/scheduler/jobs/{job_id}/runs/{run_id}", response_model=ScheduledJobRunDetail)
-async def get_scheduler_job_run(
+def get_scheduler_job_run(
     job_id: int,
     run_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_session),
 ) -> ScheduledJobRunDetail:
-    _ = _get_scheduled_job_or_404(db, job_id)
+    _assert_scheduled_job_exists(db, job_id)
     run = (
         db.query(ScheduledJobRun)
         .filter(ScheduledJobRun.job_id == job_id, ScheduledJobRun.id == run_id)
@@ -1344,16 +1687,16 @@ async def get_scheduler_job_run(
     )
     if not run:
         raise HTTPException(status_code=404, detail="Job run not found")
-    return ScheduledJobRunDetail.from_orm(run)
+    return ScheduledJobRunDetail.model_validate(run)
 
 
 @app.get("/scheduler/jobs/{job_id}/runs/{run_id}/log")
-async def get_scheduler_job_run_log(
+def get_scheduler_job_run_log(
     job_id: int,
     run_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_session),
 ):
-    _ = _get_scheduled_job_or_404(db, job_id)
+    _assert_scheduled_job_exists(db, job_id)
     run = (
         db.query(ScheduledJobRun)
         .filter(ScheduledJobRun.job_id == job_id, ScheduledJobRun.id == run_id)
@@ -1368,17 +1711,16 @@ async def get_scheduler_job_run_log(
 
 
 def _run_gemini_auto_extract(post_id: int) -> None:
-    session = SessionLocal()
+    # The Gemini call takes seconds. Load everything it needs up front and end the read
+    # transaction so the pooled connection goes back to the pool while we wait; the
+    # write below checks one out again only if there is something to save.
+    session = SessionLocal(expire_on_commit=False)
     try:
-        post = (
-            session.query(Post)
-            .options(joinedload(Post.extracted_event))
-            .filter(Post.id == post_id)
-            .one_or_none()
-        )
+        post = session.get(Post, post_id, options=[selectinload(Post.extracted_event)])
         if not post:
             return
-        settings = ensure_default_settings(session)
+        settings = settings_cache.get(session)
+        session.commit()
         changed = auto_extract_for_post(post, settings, overwrite=False)
         if changed:
             session.commit()
@@ -1386,6 +1728,6 @@ def _run_gemini_auto_extract(post_id: int) -> None:
             session.rollback()
     except Exception as exc:  # pragma: no cover - background safety
         session.rollback()
-        print(f"Gemini background extraction failed for post {post_id}: {exc}")
+        logger.warning("Gemini background extraction failed for post %s: %s", post_id, exc)
     finally:
         session.close()
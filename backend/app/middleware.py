@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+ALLOWED_METHODS = b"DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"
+PREFLIGHT_MAX_AGE = b"600"
+# Response headers this middleware owns; values set by the app are replaced.
+CORS_RESPONSE_HEADERS = (
+    b"access-control-allow-origin",
+    b"access-control-allow-credentials",
+    b"access-control-expose-headers",
+)
+
+
+class PureCORSMiddleware:
+    """Allow-all CORS handling written directly against ASGI.
+
+    Mirrors the previous ``CORSMiddleware(allow_origins=["*"], allow_credentials=True, ...)``
+    setup: the request origin is echoed back with credentials allowed, and preflight
+    requests are answered without reaching the app. Headers are added to the
+    ``http.response.start`` message only, so streaming bodies pass through untouched.
+    ``Origin`` is merged into any ``Vary`` the app already set, and ``expose_headers``
+    lists response headers cross-origin scripts may read.
+    """
+
+    def __init__(self, app: ASGIApp, expose_headers: Sequence[str] = ()) -> None:
+        self.app = app
+        self.expose_headers: Optional[bytes] = ", ".join(expose_headers).encode("latin-1") or None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin = None
+        request_method = None
+        request_headers = None
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                request_method = value
+            elif name == b"access-control-request-headers":
+                request_headers = value
+
+        if origin is None:
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] == "OPTIONS" and request_method is not None:
+            headers = _cors_headers(origin, (), None) + [
+                (b"access-control-allow-methods", ALLOWED_METHODS),
+                (b"access-control-max-age", PREFLIGHT_MAX_AGE),
+                (b"content-length", b"0"),
+            ]
+            if request_headers is not None:
+                headers.append((b"access-control-allow-headers", request_headers))
+            await send({"type": "http.response.start", "status": 204, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_with_cors(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = []
+                vary = []
+                for name, value in message.get("headers", []):
+                    if name == b"vary":
+                        vary.append(value)
+                    elif name not in CORS_RESPONSE_HEADERS:
+                        headers.append((name, value))
+                message["headers"] = headers + _cors_headers(origin, vary, self.expose_headers)
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
+
+
+def _cors_headers(
+    origin: bytes, vary: Iterable[bytes], expose_headers: Optional[bytes]
+) -> List[Tuple[bytes, bytes]]:
+    headers = [
+        (b"access-control-allow-origin", origin),
+        (b"access-control-allow-credentials", b"true"),
+        (b"vary", _merge_vary(vary)),
+    ]
+    if expose_headers:
+        headers.append((b"access-control-expose-headers", expose_headers))
+    return headers
+
+
+def _merge_vary(values: Iterable[bytes]) -> bytes:
+    tokens = [token.strip() for value in values for token in value.split(b",") if token.strip()]
+    if not any(token == b"*" or token.lower() == b"origin" for token in tokens):
+        tokens.append(b"Origin")
+    return b", ".join(tokens)
@@ -11,15 +11,18 @@ from sqlalchemy import (
     Enum,
     Float,
     ForeignKey,
+    Index,
     Integer,
     JSON,
     String,
     Text,
     UniqueConstraint,
+    and_,
+    case,
     inspect,
     text,
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import column_property, deferred, relationship
 
 from .database import Base
 
@@ -36,7 +39,7 @@ class Club(Base):
     __tablename__ = "clubs"
 
     id = Column(Integer, primary_key=True, index=True)
-    name = Column(String(255), nullable=False)
+    name = Column(String(255), nullable=False, index=True)
     username = Column(String(255), unique=True, nullable=False, index=True)
     active = Column(Boolean, default=True, nullable=False)
     classification_mode = Column(String(20), default=ClassificationModeEnum.AUTO, nullable=False)
@@ -73,6 +76,45 @@ class Post(Base):
     )
 
 
+# Covers the "recent instagram ids for a club" lookup done before every fetch, so SQLite
+# can answer it from the index without touching the table rows.
+Index("ix_posts_club_timestamp_instagram_id", Post.club_id, Post.post_timestamp.desc(), Post.instagram_id)
+
+# /posts pages newest-first on (post_timestamp, id); with the id in the key each page
+# is a bounded range scan instead of a sort.
+Index("ix_posts_timestamp_id", Post.post_timestamp.desc(), Post.id.desc())
+
+# One partial index per review status so the filtered /posts listings read the newest
+# matching rows in order and the /stats counts scan only their own slice. SQLite only
+# uses a partial index when the query repeats its WHERE term, so these mirror the
+# ``is_(...)`` filters in main.py exactly.
+Index(
+    "ix_posts_pending_timestamp_id",
+    Post.post_timestamp.desc(),
+    Post.id.desc(),
+    sqlite_where=Post.is_event_poster.is_(None),
+)
+Index(
+    "ix_posts_event_timestamp_id",
+    Post.post_timestamp.desc(),
+    Post.id.desc(),
+    sqlite_where=Post.is_event_poster.is_(True),
+)
+Index(
+    "ix_posts_non_event_timestamp_id",
+    Post.post_timestamp.desc(),
+    Post.id.desc(),
+    sqlite_where=Post.is_event_poster.is_(False),
+)
+
+# Indexes replaced by the ones above; dropped by ``ensure_indexes``.
+SUPERSEDED_INDEXES = (
+    "ix_posts_pending_timestamp",
+    "ix_posts_event_timestamp",
+    "ix_posts_non_event_timestamp",
+)
+
+
 class ExtractedEvent(Base):
     __tablename__ = "extracted_events"
 
@@ -99,7 +141,7 @@ class SystemSetting(Base):
     apify_enabled = Column(Boolean, default=False, nullable=False)
     apify_actor_id = Column(String(255), default=DEFAULT_APIFY_ACTOR_ID, nullable=True)
     apify_results_limit = Column(Integer, default=30, nullable=False)
-    apify_api_token = Column(String(512), nullable=True)
+    apify_api_token = deferred(Column(String(512), nullable=True))
     instagram_fetcher = Column(String(20), default="instaloader", nullable=False)
     gemini_api_key = Column(String(512), nullable=True)
     gemini_auto_extract = Column(Boolean, default=False, nullable=False)
@@ -108,8 +150,37 @@ class SystemSetting(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
 
-def ensure_default_settings(session) -> SystemSetting:
-    bind = session.get_bind()
+# Computed in SQL so views that only report whether a token exists never load the secret itself.
+SystemSetting.has_apify_token = column_property(
+    case(
+        (and_(SystemSetting.apify_api_token.is_not(None), SystemSetting.apify_api_token != ""), True),
+        else_=False,
+    )
+)
+
+
+def run_migrations(bind) -> None:
+    """Create missing tables, indexes and settings columns; run once per deploy rather than on every boot."""
+    Base.metadata.create_all(bind=bind)
+    ensure_indexes(bind)
+    upgrade_system_settings_columns(bind)
+
+
+def ensure_indexes(bind) -> None:
+    """Create model indexes that databases created by older releases are missing.
+
+    ``create_all`` skips tables that already exist, including their indexes.
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=bind, checkfirst=True)
+    with bind.begin() as conn:
+        for name in SUPERSEDED_INDEXES:
+            conn.exec_driver_sql(f"DROP INDEX IF EXISTS {name}")
+
+
+def upgrade_system_settings_columns(bind) -> None:
+    """Add settings columns introduced after a database was first created."""
     inspector = inspect(bind)
     columns = {col["name"] for col in inspector.get_columns("system_settings")}
 
@@ -137,6 +208,8 @@ def ensure_default_settings(session) -> SystemSetting:
                 conn.execute(text(f"ALTER TABLE system_settings {statement}"))
             conn.commit()
 
+
+def ensure_default_settings(session) -> SystemSetting:
     setting: Optional[SystemSetting] = session.query(SystemSetting).order_by(SystemSetting.id).first()
     updated = False
     if setting is None:
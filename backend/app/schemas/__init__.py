@@ -1,9 +1,17 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Annotated, Any, Dict, List, Optional
 
-from pydantic import BaseModel, Field, root_validator, validator
+from pydantic import BaseModel, BeforeValidator, ConfigDict, Field, field_validator, model_validator
+
+
+def _isoformat(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+# Timestamps are sent as ISO strings; ORM rows hand over datetimes, which are formatted on the way in.
+IsoDateTime = Annotated[str, BeforeValidator(_isoformat)]
 
 
 class ClubBase(BaseModel):
@@ -25,80 +33,41 @@ class ClubUpdate(BaseModel):
 
 class ClubOut(ClubBase):
     id: int
-    last_checked: Optional[str]
-    created_at: str
-    updated_at: str
-
-    @validator('last_checked', pre=True)
-    def format_last_checked(cls, v):
-        if isinstance(v, datetime):
-            return v.isoformat()
-        return v
-
-    @validator('created_at', pre=True)
-    def format_created_at(cls, v):
-        if isinstance(v, datetime):
-            return v.isoformat()
-        return v
-
-    @validator('updated_at', pre=True)
-    def format_updated_at(cls, v):
-        if isinstance(v, datetime):
-            return v.isoformat()
-        return v
+    last_checked: Optional[IsoDateTime] = None
+    created_at: IsoDateTime
+    updated_at: IsoDateTime
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class ExtractedEventOut(BaseModel):
     id: int
     post_id: int
     event_data_json: Any
-    extraction_confidence: Optional[float]
-    created_at: str
+    extraction_confidence: Optional[float] = None
+    created_at: IsoDateTime
     imported_to_eventscrape: bool
 
-    @validator('created_at', pre=True)
-    def format_created_at(cls, v):
-        if isinstance(v, datetime):
-            return v.isoformat()
-        return v
-
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class PostOut(BaseModel):
     id: int
     club_id: int
     instagram_id: str
-    image_url: Optional[str]
-    local_image_path: Optional[str]
-    caption: Optional[str]
-    post_timestamp: str
-    collected_at: str
-    is_event_poster: Optional[bool]
-    classification_confidence: Optional[float]
+    image_url: Optional[str] = None
+    local_image_path: Optional[str] = None
+    caption: Optional[str] = None
+    post_timestamp: IsoDateTime
+    collected_at: IsoDateTime
+    is_event_poster: Optional[bool] = None
+    classification_confidence: Optional[float] = None
     processed: bool
-    manual_review_notes: Optional[str]
+    manual_review_notes: Optional[str] = None
     club: ClubOut
     extracted_event: Optional[ExtractedEventOut] = None
 
-    @validator('post_timestamp', pre=True)
-    def format_post_timestamp(cls, v):
-        if isinstance(v, datetime):
-            return v.isoformat()
-        return v
-
-    @validator('collected_at', pre=True)
-    def format_collected_at(cls, v):
-        if isinstance(v, datetime):
-            return v.isoformat()
-        return v
-
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class PostClassificationRequest(BaseModel):
@@ -116,19 +85,12 @@ class ExtractedEventWithPostOut(BaseModel):
     id: int
     post_id: int
     event_data_json: Any
-    extraction_confidence: Optional[float]
-    created_at: str
+    extraction_confidence: Optional[float] = None
+    created_at: IsoDateTime
     imported_to_eventscrape: bool
     post: PostOut
 
-    @validator('created_at', pre=True)
-    def format_created_at(cls, v):
-        if isinstance(v, datetime):
-            return v.isoformat()
-        return v
-
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class MonitorStatus(BaseModel):
@@ -142,16 +104,10 @@ class MonitorStatus(BaseModel):
     instagram_fetcher: str = Field(pattern="^(instaloader|apify)$")
     apify_runner: str = Field(pattern="^(disabled|unconfigured|rest|rest_fallback|node)$")
     session_username: Optional[str] = None
-    session_uploaded_at: Optional[str] = None
+    session_uploaded_at: Optional[IsoDateTime] = None
     session_age_minutes: Optional[int] = None
     is_rate_limited: bool = False
-    rate_limit_until: Optional[str] = None
-
-    @validator('session_uploaded_at', 'rate_limit_until', pre=True)
-    def format_iso_datetime(cls, v):
-        if isinstance(v, datetime):
-            return v.isoformat()
-        return v
+    rate_limit_until: Optional[IsoDateTime] = None
 
 
 class CSVImportResponse(BaseModel):
@@ -172,53 +128,43 @@ class SystemSettingsOut(BaseModel):
     monitoring_enabled: bool
     monitor_interval_minutes: int
     classification_mode: str = Field(pattern="^(manual|auto)$")
-    instaloader_username: Optional[str]
-    instaloader_session_uploaded_at: Optional[str]
+    instaloader_username: Optional[str] = None
+    instaloader_session_uploaded_at: Optional[IsoDateTime] = None
     club_fetch_delay_seconds: int
     apify_enabled: bool
-    apify_actor_id: Optional[str]
+    apify_actor_id: Optional[str] = None
     apify_results_limit: int
     has_apify_token: bool
     has_gemini_api_key: bool
     gemini_auto_extract: bool
     instagram_fetcher: str = Field(pattern="^(instaloader|apify)$")
     scheduler_enabled: bool
-    created_at: str
-    updated_at: str
-
-    @validator('created_at', pre=True)
-    def format_created_at(cls, v):
-        if isinstance(v, datetime):
-            return v.isoformat()
-        return v
-
-    @validator('updated_at', pre=True)
-    def format_updated_at(cls, v):
-        if isinstance(v, datetime):
-            return v.isoformat()
-        return v
+    created_at: IsoDateTime
+    updated_at: IsoDateTime
 
-    @validator('instaloader_session_uploaded_at', pre=True)
-    def format_instaloader_uploaded_at(cls, v):
-        if isinstance(v, datetime):
-            return v.isoformat()
-        return v
-
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class SystemSettingsUpdate(BaseModel):
     classification_mode: Optional[str] = Field(default=None, pattern="^(manual|auto)$")
-    monitor_interval_minutes: Optional[int] = Field(default=None, ge=1)
-    club_fetch_delay_seconds: Optional[int] = Field(default=None, ge=0)
+    # Interval, delay and fetcher choice are range-checked by the endpoint, which answers
+    # with its established 400 messages rather than a 422.
+    monitor_interval_minutes: Optional[int] = None
+    club_fetch_delay_seconds: Optional[int] = None
     apify_enabled: Optional[bool] = None
     apify_actor_id: Optional[str] = None
     apify_results_limit: Optional[int] = Field(default=None, ge=1, le=1000)
-    instagram_fetcher: Optional[str] = Field(default=None, pattern="^(instaloader|apify)$")
+    instagram_fetcher: Optional[str] = None
     gemini_auto_extract: Optional[bool] = None
     scheduler_enabled: Optional[bool] = None
 
+    @field_validator("classification_mode", "instagram_fetcher", mode="before")
+    @classmethod
+    def normalize_choice(cls, v):
+        if isinstance(v, str):
+            return v.strip().lower()
+        return v
+
 
 class ApifyTokenUpdate(BaseModel):
     token: Optional[str] = None
@@ -238,15 +184,12 @@ class ApifyTestPostOut(BaseModel):
     username: Optional[str] = None
     caption: Optional[str] = None
     image_url: Optional[str] = None
-    timestamp: Optional[str] = None
+    timestamp: Optional[IsoDateTime] = None
     is_video: bool = False
     permalink: Optional[str] = None
 
-    @validator("timestamp", pre=True)
-    def format_timestamp(cls, v):
-        if isinstance(v, datetime):
-            return v.isoformat()
-        return v
+    # Apify items sometimes carry numeric ids.
+    model_config = ConfigDict(coerce_numbers_to_str=True)
 
 
 class ApifyTestResponse(BaseModel):
@@ -284,10 +227,10 @@ class EventExportItem(BaseModel):
     post_instagram_id: str
     post_url: str
     post_timestamp: str
-    post_caption: Optional[str]
-    post_image_url: Optional[str]
+    post_caption: Optional[str] = None
+    post_image_url: Optional[str] = None
     payload: Any
-    extraction_confidence: Optional[float]
+    extraction_confidence: Optional[float] = None
 
 
 class ClubEventsExport(BaseModel):
@@ -311,20 +254,17 @@ class ScheduledJobBase(BaseModel):
     skip_if_manual_running: bool = True
     payload: Optional[Dict[str, Any]] = None
 
-    @root_validator
-    def validate_schedule(cls, values):
-        schedule_type = values.get("schedule_type", "interval")
-        cron_expression = values.get("cron_expression")
-        interval_minutes = values.get("interval_minutes")
-        if schedule_type == "cron":
-            if not cron_expression:
+    @model_validator(mode="after")
+    def validate_schedule(self):
+        if self.schedule_type == "cron":
+            if not self.cron_expression:
                 raise ValueError("cron_expression is required when schedule_type is 'cron'")
-            values["interval_minutes"] = None
+            self.interval_minutes = None
         else:
-            if interval_minutes is None:
+            if self.interval_minutes is None:
                 raise ValueError("interval_minutes is required when schedule_type is 'interval'")
-            values["cron_expression"] = None
-        return values
+            self.cron_expression = None
+        return self
 
 
 class ScheduledJobCreate(ScheduledJobBase):
@@ -350,46 +290,32 @@ class ScheduledJobOut(BaseModel):
     job_type: str
     enabled: bool
     schedule_type: str
-    cron_expression: Optional[str]
-    interval_minutes: Optional[int]
-    timezone: Optional[str]
+    cron_expression: Optional[str] = None
+    interval_minutes: Optional[int] = None
+    timezone: Optional[str] = None
     skip_if_running: bool
     skip_if_manual_running: bool
     payload: Optional[Dict[str, Any]]
-    last_run_at: Optional[str]
-    next_run_at: Optional[str] = None
-    created_at: str
-    updated_at: str
-
-    @validator("created_at", "updated_at", "last_run_at", "next_run_at", pre=True)
-    def format_times(cls, v):
-        if isinstance(v, datetime):
-            return v.isoformat()
-        return v
+    last_run_at: Optional[IsoDateTime] = None
+    next_run_at: Optional[IsoDateTime] = None
+    created_at: IsoDateTime
+    updated_at: IsoDateTime
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class ScheduledJobRunOut(BaseModel):
     id: int
     job_id: int
     status: str
-    started_at: str
-    finished_at: Optional[str]
-    detail: Optional[str]
-    log_excerpt: Optional[str]
-
-    @validator("started_at", "finished_at", pre=True)
-    def format_run_times(cls, v):
-        if isinstance(v, datetime):
-            return v.isoformat()
-        return v
+    started_at: IsoDateTime
+    finished_at: Optional[IsoDateTime] = None
+    detail: Optional[str] = None
+    log_excerpt: Optional[str] = None
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class ScheduledJobRunDetail(ScheduledJobRunOut):
-    log_path: Optional[str]
+    log_path: Optional[str] = None
     payload_snapshot: Optional[Dict[str, Any]]
@@ -18,10 +18,10 @@ def main() -> None:
 
     Base.metadata.create_all(bind=engine)
 
-    csv_text = args.csv_path.read_text(encoding="utf-8-sig")
     session = SessionLocal()
     try:
-        created, updated = import_clubs_from_csv(session, csv_text)
+        with args.csv_path.open(encoding="utf-8-sig", newline="") as csv_file:
+            created, updated = import_clubs_from_csv(session, csv_file)
     finally:
         session.close()
 
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from ..database import SessionLocal, engine, optimize_database
+from ..models import ensure_default_settings, run_migrations
+
+
+def main() -> None:
+    run_migrations(engine)
+
+    session = SessionLocal()
+    try:
+        ensure_default_settings(session)
+    finally:
+        session.close()
+
+    optimize_database()
+    print("Database schema is up to date.")
+
+
+if __name__ == "__main__":
+    main()
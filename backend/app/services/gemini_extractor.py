@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import base64
 import json
+import logging
 import mimetypes
 import os
 import re
@@ -17,6 +18,8 @@ try:  # pragma: no cover - dependency is optional for tests
 except ImportError:  # pragma: no cover
     genai = None  # type: ignore
 
+logger = logging.getLogger(__name__)
+
 
 PROMPTS_DIR = Path(__file__).resolve().parent / "prompts"
 GEMINI_PROMPT_PATH = PROMPTS_DIR / "gemini_event_prompt.md"
@@ -29,6 +32,9 @@ except OSError as exc:  # pragma: no cover - fail fast when prompt file missing
 
 
 GEMINI_MODEL_ID = os.getenv("GEMINI_MODEL_ID", "gemini-2.5-flash")
+# Fallback used when no key is stored in the settings row; the environment is fixed for
+# the life of the process, so it is read once here rather than on every request.
+GEMINI_ENV_API_KEY = os.getenv("GEMINI_API_KEY", "").strip()
 
 CODE_FENCE_PATTERN = re.compile(r"```(?:json)?|```", re.IGNORECASE)
 JSON_OBJECT_PATTERN = re.compile(r"\{[\s\S]*\}")
@@ -171,13 +177,26 @@ def extract_event_data_for_post(post: Post, api_key: str) -> Tuple[Dict[str, Any
     return result, downloaded_filename
 
 
+def extraction_confidence_from_payload(payload: Any) -> Optional[float]:
+    """Return ``payload["extractionConfidence"]["overall"]`` as a float, or None if absent or malformed."""
+    try:
+        return float(payload["extractionConfidence"]["overall"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def resolve_gemini_api_key(settings) -> str:
+    """Return the stored Gemini key, falling back to ``GEMINI_API_KEY``; empty when neither is set."""
+    return (getattr(settings, "gemini_api_key", "") or "").strip() or GEMINI_ENV_API_KEY
+
+
 def auto_extract_for_post(post: Post, settings, *, overwrite: bool = False) -> bool:
     """Auto-run Gemini extraction when enabled; swallow errors and report success status."""
 
     if not getattr(settings, "gemini_auto_extract", False):
         return False
 
-    api_key = (getattr(settings, "gemini_api_key", "") or "").strip() or os.getenv("GEMINI_API_KEY", "").strip()
+    api_key = resolve_gemini_api_key(settings)
     if not api_key:
         return False
 
@@ -187,22 +206,13 @@ def auto_extract_for_post(post: Post, settings, *, overwrite: bool = False) -> b
     try:
         payload, downloaded_filename = extract_event_data_for_post(post, api_key)
     except GeminiExtractionError as exc:  # pragma: no cover - network failures
-        print(f"Gemini auto extraction failed for post {post.instagram_id}: {exc}")
+        logger.warning("Gemini auto extraction failed for post %s: %s", post.instagram_id, exc)
         return False
 
     if downloaded_filename and downloaded_filename != post.local_image_path:
         post.local_image_path = downloaded_filename
 
-    extraction_confidence = None
-    confidence_payload = None
-    if isinstance(payload, dict):
-        confidence_payload = payload.get("extractionConfidence")
-    if isinstance(confidence_payload, dict):
-        overall = confidence_payload.get("overall")
-        try:
-            extraction_confidence = float(overall) if overall is not None else None
-        except (TypeError, ValueError):
-            extraction_confidence = None
+    extraction_confidence = extraction_confidence_from_payload(payload)
 
     if post.extracted_event:
         post.extracted_event.event_data_json = payload
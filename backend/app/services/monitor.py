@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import json
+import logging
 import os
 import random
 import time
@@ -10,20 +12,26 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
 
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
+from ..database import session_scope
 from ..models import (
     Club,
     Post,
+    SystemSetting,
     ClassificationModeEnum,
-    ensure_default_settings,
     DEFAULT_APIFY_ACTOR_ID as MODEL_DEFAULT_APIFY_ACTOR_ID,
 )
 from .classifier import CaptionClassifier
 from .gemini_extractor import auto_extract_for_post
+from .settings_cache import settings_cache
 from ..utils.image_downloader import download_image
 from ..utils.apify_client import ApifyClient, ApifyClientError, ApifyRunTimeoutError
 
+logger = logging.getLogger(__name__)
+
 APIFY_DEFAULT_INPUT = {
     "skipPinnedPosts": False,
 }
@@ -69,6 +77,7 @@ class MonitorService:
         self._known_post_break_threshold = int(os.getenv("INSTAGRAM_KNOWN_POST_BREAK_THRESHOLD", "2"))
         self._apify_client: Optional[ApifyClient] = None
         self._apify_signature: Optional[str] = None
+        self._apify_settings_version: Optional[int] = None
         self._apify_timeout_seconds = int(os.getenv("APIFY_RUN_TIMEOUT_SECONDS", "180"))
         self._run_lock: asyncio.Lock = asyncio.Lock()
         self._run_state_lock: asyncio.Lock = asyncio.Lock()
@@ -131,8 +140,6 @@ class MonitorService:
             compress_json=False,
         )
         # Set logging level to ERROR to reduce noise
-        import logging
-
         logging.getLogger("instaloader").setLevel(logging.ERROR)
         return loader
 
@@ -215,9 +222,9 @@ class MonitorService:
     def fetch_latest_posts_for_clubs(self, session: Session, post_count: int = 3) -> Dict[str, int]:
         """Fetch the latest N posts from all active clubs, regardless of last check time"""
         stats = {"clubs": 0, "posts": 0, "classified": 0}
-        self._last_run = datetime.utcnow()
+        run_started = self._last_run = datetime.utcnow()
 
-        settings = ensure_default_settings(session)
+        settings = settings_cache.get(session)
         if self._in_backoff():
             fetch_mode = self._get_fetch_mode(settings)
             if fetch_mode == "apify" and self._should_use_apify(settings):
@@ -229,16 +236,12 @@ class MonitorService:
         clubs: Iterable[Club] = session.query(Club).filter(Club.active.is_(True)).all()
         mode = self._get_fetch_mode(settings)
         apify_bulk_cache: Dict[str, List[Dict]] = {}
-        known_map: Dict[str, Set[str]] = {}
+        known_map = self._get_known_post_map(session, clubs)
         if mode == "apify":
             apify_client = self._get_apify_client(settings)
             if not apify_client:
                 raise ApifyIntegrationError("Apify integration is not configured.")
             usernames = [club.username for club in clubs]
-            known_map = {
-                club.username: self._get_recent_post_ids(session, club.id)
-                for club in clubs
-            }
             configured_limit = settings.apify_results_limit or post_count
             limit = max(1, min(configured_limit, post_count))
             apify_bulk_cache = self._collect_posts_via_apify_bulk(
@@ -248,10 +251,11 @@ class MonitorService:
                 known_map,
             )
 
+        checked_ids: List[int] = []
         try:
             for club in clubs:
                 stats["clubs"] += 1
-                known_post_ids = known_map.get(club.username) if mode == "apify" else self._get_recent_post_ids(session, club.id)
+                known_post_ids = known_map.get(club.username, set())
                 if mode == "apify":
                     posts = apify_bulk_cache.get(club.username, [])
                 else:
@@ -261,14 +265,14 @@ class MonitorService:
                         post_count,
                         known_post_ids,
                     )
-                for post in posts:
-                    auto_classify = global_auto and (club.classification_mode or ClassificationModeEnum.MANUAL).lower() == ClassificationModeEnum.AUTO
-                    if self._create_post_if_new(session, club, post, auto_classify, settings):
-                        stats["posts"] += 1
-                        if auto_classify:
-                            stats["classified"] += 1
-                club.last_checked = datetime.utcnow()
+                auto_classify = global_auto and (club.classification_mode or ClassificationModeEnum.MANUAL).lower() == ClassificationModeEnum.AUTO
+                created = self._create_posts_if_new(session, club, posts, auto_classify, settings, known_post_ids)
+                stats["posts"] += created
+                if auto_classify:
+                    stats["classified"] += created
+                checked_ids.append(club.id)
                 self._apply_delay(settings.club_fetch_delay_seconds)
+            self._mark_clubs_checked(session, checked_ids, run_started)
             session.commit()
             self.clear_last_error()
             self.clear_backoff()
@@ -300,10 +304,7 @@ class MonitorService:
             known_post_ids,
         )
 
-        created = 0
-        for post in posts:
-            if self._create_post_if_new(session, club, post, auto_classify, settings):
-                created += 1
+        created = self._create_posts_if_new(session, club, posts, auto_classify, settings, known_post_ids)
 
         club.last_checked = datetime.utcnow()
         session.commit()
@@ -364,7 +365,7 @@ class MonitorService:
 
     def monitor_active_clubs(self, session: Session) -> Dict[str, int]:
         stats = {"clubs": 0, "posts": 0, "classified": 0}
-        settings = ensure_default_settings(session)
+        settings = settings_cache.get(session)
         if not settings.monitoring_enabled:
             return stats
 
@@ -377,20 +378,16 @@ class MonitorService:
 
         global_auto = (settings.classification_mode or ClassificationModeEnum.MANUAL).lower() == ClassificationModeEnum.AUTO
 
-        self._last_run = datetime.utcnow()
+        run_started = self._last_run = datetime.utcnow()
         clubs: Iterable[Club] = session.query(Club).filter(Club.active.is_(True)).all()
         mode = self._get_fetch_mode(settings)
         apify_bulk_cache: Dict[str, List[Dict]] = {}
-        known_map: Dict[str, Set[str]] = {}
+        known_map = self._get_known_post_map(session, clubs)
         if mode == "apify":
             apify_client = self._get_apify_client(settings)
             if not apify_client:
                 raise ApifyIntegrationError("Apify integration is not configured.")
             usernames = [club.username for club in clubs]
-            known_map = {
-                club.username: self._get_recent_post_ids(session, club.id)
-                for club in clubs
-            }
             limit = settings.apify_results_limit or 30
             apify_bulk_cache = self._collect_posts_via_apify_bulk(
                 apify_client,
@@ -399,12 +396,13 @@ class MonitorService:
                 known_map,
             )
 
+        checked_ids: List[int] = []
         try:
             for club in clubs:
                 stats["clubs"] += 1
                 lookback_start = club.last_checked or (datetime.utcnow() - timedelta(hours=24))
                 lookback_start -= timedelta(minutes=5)
-                known_post_ids = known_map.get(club.username) if mode == "apify" else self._get_recent_post_ids(session, club.id)
+                known_post_ids = known_map.get(club.username, set())
                 if mode == "apify":
                     posts = [
                         post
@@ -418,14 +416,14 @@ class MonitorService:
                         lookback_start,
                         known_post_ids,
                     )
-                for post in posts:
-                    auto_classify = global_auto and (club.classification_mode or ClassificationModeEnum.MANUAL).lower() == ClassificationModeEnum.AUTO
-                    if self._create_post_if_new(session, club, post, auto_classify, settings):
-                        stats["posts"] += 1
-                        if auto_classify:
-                            stats["classified"] += 1
-                club.last_checked = datetime.utcnow()
+                auto_classify = global_auto and (club.classification_mode or ClassificationModeEnum.MANUAL).lower() == ClassificationModeEnum.AUTO
+                created = self._create_posts_if_new(session, club, posts, auto_classify, settings, known_post_ids)
+                stats["posts"] += created
+                if auto_classify:
+                    stats["classified"] += created
+                checked_ids.append(club.id)
                 self._apply_delay(settings.club_fetch_delay_seconds)
+            self._mark_clubs_checked(session, checked_ids, run_started)
             session.commit()
             self.clear_last_error()
             self.clear_backoff()
@@ -436,49 +434,76 @@ class MonitorService:
             session.rollback()
             raise
 
-    def _create_post_if_new(
+    def _create_posts_if_new(
         self,
         session: Session,
         club: Club,
-        post: Dict,
+        posts: List[Dict],
         auto_classify: bool,
         settings,
-    ) -> bool:
-        existing = session.query(Post).filter(Post.instagram_id == post["id"]).one_or_none()
-        if existing:
-            return False
-        is_event = None
-        confidence = None
-        if auto_classify:
-            is_event_bool, conf = self.classifier.classify(post.get("caption"))
-            is_event = is_event_bool
-            confidence = conf
-
-        # Download image locally
-        local_image_filename = None
-        if post.get("image_url"):
-            local_image_filename = download_image(post["image_url"], post["id"])
-
-        db_post = Post(
-            club_id=club.id,
-            instagram_id=post["id"],
-            image_url=post.get("image_url"),
-            local_image_path=local_image_filename,
-            caption=post.get("caption"),
-            post_timestamp=post.get("timestamp", datetime.utcnow()),
-            is_event_poster=is_event,
-            classification_confidence=confidence,
-            processed=False,
-        )
-        session.add(db_post)
-        session.flush()
+        known_post_ids: Optional[Set[str]] = None,
+    ) -> int:
+        """Insert all unseen posts for a club in one statement and return how many were created.
+
+        Duplicates are resolved by ``ON CONFLICT DO NOTHING``; images are only downloaded for
+        the rows the insert actually returned.
+        """
+        seen: Set[str] = set(known_post_ids or ())
+        rows: List[Dict[str, Any]] = []
+        now = datetime.utcnow()
+        for post in posts:
+            instagram_id = post.get("id")
+            if not instagram_id or instagram_id in seen:
+                continue
+            seen.add(instagram_id)
+            is_event = None
+            confidence = None
+            if auto_classify:
+                is_event, confidence = self.classifier.classify(post.get("caption"))
 
-        if is_event:
+            rows.append(
+                {
+                    "club_id": club.id,
+                    "instagram_id": instagram_id,
+                    "image_url": post.get("image_url"),
+                    "local_image_path": None,
+                    "caption": post.get("caption"),
+                    "post_timestamp": post.get("timestamp", now),
+                    "collected_at": now,
+                    "is_event_poster": is_event,
+                    "classification_confidence": confidence,
+                    "processed": False,
+                }
+            )
+        if not rows:
+            return 0
+
+        inserted = session.execute(
+            sqlite_insert(Post)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=["instagram_id"])
+            .returning(Post.id, Post.instagram_id, Post.image_url, Post.is_event_poster)
+        ).all()
+
+        image_paths: List[Dict[str, Any]] = []
+        for post_id, instagram_id, image_url, _ in inserted:
+            if not image_url:
+                continue
+            local_image_filename = download_image(image_url, instagram_id)
+            if local_image_filename:
+                image_paths.append({"id": post_id, "local_image_path": local_image_filename})
+        if image_paths:
+            session.execute(update(Post), image_paths)
+
+        for post_id, _, _, is_event in inserted:
+            if not is_event:
+                continue
+            db_post = session.get(Post, post_id)
             try:
                 auto_extract_for_post(db_post, settings, overwrite=False)
             except Exception as exc:  # pragma: no cover - safeguard against unexpected errors
-                print(f"Gemini auto extraction error for post {db_post.instagram_id}: {exc}")
-        return True
+                logger.exception("Gemini auto extraction error for post %s", db_post.instagram_id)
+        return len(inserted)
 
     def _apply_delay(self, delay_seconds: Optional[int]) -> None:
         if not delay_seconds:
@@ -498,7 +523,7 @@ class MonitorService:
             self._next_run_eta_seconds = None
             session = session_factory()
             try:
-                settings = ensure_default_settings(session)
+                settings = settings_cache.get(session)
                 interval = max(settings.monitor_interval_minutes or default_interval, 5)
                 self.monitor_active_clubs(session)
             except RateLimitError:
@@ -518,14 +543,50 @@ class MonitorService:
             await asyncio.sleep(sleep_seconds)
 
     def _get_recent_post_ids(self, session: Session, club_id: int, limit: int = 20) -> Set[str]:
-        rows = (
-            session.query(Post.instagram_id)
-            .filter(Post.club_id == club_id)
+        stmt = (
+            select(Post.instagram_id)
+            .where(Post.club_id == club_id)
             .order_by(Post.post_timestamp.desc())
             .limit(limit)
-            .all()
         )
-        return {row[0] for row in rows if row[0]}
+        return {instagram_id for instagram_id in session.execute(stmt).scalars() if instagram_id}
+
+    def _mark_clubs_checked(self, session: Session, club_ids: List[int], checked_at: datetime) -> None:
+        """Stamp ``last_checked`` for a whole run with one UPDATE.
+
+        ``checked_at`` is the run's start time, so the next pass's lookback window
+        never starts after a club was actually fetched.
+        """
+        if club_ids:
+            session.execute(update(Club).where(Club.id.in_(club_ids)).values(last_checked=checked_at))
+
+    def _get_recent_post_ids_bulk(
+        self, session: Session, club_ids: List[int], limit: int = 20
+    ) -> Dict[int, Set[str]]:
+        """Same as :meth:`_get_recent_post_ids` for many clubs, in one windowed query."""
+        known: Dict[int, Set[str]] = {club_id: set() for club_id in club_ids}
+        if not club_ids:
+            return known
+        ranked = (
+            select(
+                Post.club_id,
+                Post.instagram_id,
+                func.row_number()
+                .over(partition_by=Post.club_id, order_by=Post.post_timestamp.desc())
+                .label("recency"),
+            )
+            .where(Post.club_id.in_(club_ids))
+            .subquery()
+        )
+        stmt = select(ranked.c.club_id, ranked.c.instagram_id).where(ranked.c.recency <= limit)
+        for club_id, instagram_id in session.execute(stmt):
+            if instagram_id:
+                known[club_id].add(instagram_id)
+        return known
+
+    def _get_known_post_map(self, session: Session, clubs: Iterable[Club]) -> Dict[str, Set[str]]:
+        known_by_id = self._get_recent_post_ids_bulk(session, [club.id for club in clubs])
+        return {club.username: known_by_id[club.id] for club in clubs}
 
     def _schedule_backoff(self, minutes: Optional[int] = None) -> None:
         minutes = minutes or self._rate_limit_backoff_minutes
@@ -621,7 +682,7 @@ class MonitorService:
         return normalized
 
     def _apify_ready(self, settings) -> bool:
-        return bool(getattr(settings, "apify_api_token", None) and getattr(settings, "apify_actor_id", None))
+        return bool(getattr(settings, "has_apify_token", False) and getattr(settings, "apify_actor_id", None))
 
     def _should_use_apify(self, settings) -> bool:
         mode = self._get_fetch_mode(settings)
@@ -659,21 +720,35 @@ class MonitorService:
         if not self._should_use_apify(settings):
             return None
         actor_id = getattr(settings, "apify_actor_id", None) or DEFAULT_APIFY_ACTOR_ID
-        signature = f"{settings.apify_api_token}:{actor_id}"
+        # The deferred token is only re-read after a settings write; the client itself is
+        # keyed on a digest of the token and the actor, so unrelated writes keep it alive.
+        version = settings_cache.version
+        if self._apify_client and self._apify_settings_version == version:
+            return self._apify_client
+        token = self._load_apify_token()
+        signature = f"{hashlib.sha256((token or '').encode()).hexdigest()}:{actor_id}"
         if self._apify_client and self._apify_signature == signature:
+            self._apify_settings_version = version
             return self._apify_client
         if self._apify_client:
             self._apify_client.close()
             self._apify_client = None
         try:
-            self._apify_client = ApifyClient(settings.apify_api_token, actor_id)
+            self._apify_client = ApifyClient(token, actor_id)
         except ValueError as exc:
             self.set_last_error(str(exc))
             self._apify_client = None
             return None
         self._apify_signature = signature
+        self._apify_settings_version = version
         return self._apify_client
 
+    def _load_apify_token(self) -> Optional[str]:
+        with session_scope() as session:
+            return session.scalar(
+                select(SystemSetting.apify_api_token).order_by(SystemSetting.id).limit(1)
+            )
+
     def _collect_posts_via_apify(
         self,
         client: ApifyClient,
@@ -933,7 +1008,16 @@ class MonitorService:
             return stats
 
         global_auto = (settings.classification_mode or ClassificationModeEnum.MANUAL).lower() == ClassificationModeEnum.AUTO
-        known_ids_cache: Dict[int, Set[str]] = {}
+        usernames = {
+            (item.get("username") or "").lstrip("@").strip("/")
+            for item in posts_data
+        }
+        usernames.discard("")
+        clubs_by_username: Dict[str, Club] = {
+            club.username: club
+            for club in session.query(Club).filter(Club.username.in_(usernames))
+        } if usernames else {}
+        posts_by_club: Dict[int, List[Dict[str, Any]]] = {}
 
         for item in posts_data:
             username_value = item.get("username")
@@ -942,16 +1026,11 @@ class MonitorService:
                 stats["missing_clubs"] += 1
                 continue
 
-            club = session.query(Club).filter(Club.username == username).one_or_none()
+            club = clubs_by_username.get(username)
             if not club:
                 stats["missing_clubs"] += 1
                 continue
 
-            known_ids = known_ids_cache.get(club.id)
-            if known_ids is None:
-                known_ids = self._get_recent_post_ids(session, club.id)
-                known_ids_cache[club.id] = known_ids
-
             timestamp_value = item.get("timestamp")
             timestamp_dt = datetime.utcnow()
             if isinstance(timestamp_value, str):
@@ -960,7 +1039,6 @@ class MonitorService:
                 except ValueError:
                     pass
 
-            auto_classify = global_auto and (club.classification_mode or ClassificationModeEnum.MANUAL).lower() == ClassificationModeEnum.AUTO
             post_payload = {
                 "id": item.get("id"),
                 "caption": item.get("caption") or "",
@@ -973,13 +1051,17 @@ class MonitorService:
                 stats["missing_clubs"] += 1
                 continue
 
-            created = self._create_post_if_new(session, club, post_payload, auto_classify, settings)
+            posts_by_club.setdefault(club.id, []).append(post_payload)
+
+        clubs_by_id = {club.id: club for club in clubs_by_username.values()}
+        for club_id, club_posts in posts_by_club.items():
+            club = clubs_by_id[club_id]
+            auto_classify = global_auto and (club.classification_mode or ClassificationModeEnum.MANUAL).lower() == ClassificationModeEnum.AUTO
+            created = self._create_posts_if_new(session, club, club_posts, auto_classify, settings)
+            stats["created"] += created
+            stats["skipped_existing"] += len(club_posts) - created
             if created:
-                stats["created"] += 1
-                known_ids.add(post_payload["id"])
                 club.last_checked = datetime.utcnow()
-            else:
-                stats["skipped_existing"] += 1
 
         session.commit()
 
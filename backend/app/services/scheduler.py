@@ -8,7 +8,7 @@ import os
 from contextlib import redirect_stderr, redirect_stdout
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from zoneinfo import ZoneInfo
 
 from apscheduler.job import Job as APSJob
@@ -28,6 +28,8 @@ logger = logging.getLogger(__name__)
 SUPPORTED_JOB_TYPES = {"apify_pull"}
 LOG_DIR = Path(os.getenv("SCHEDULER_LOG_DIR", "/data/scheduler_logs"))
 LOG_DIR.mkdir(parents=True, exist_ok=True)
+# Late firings (event loop busy, host asleep) still run within this window instead of being dropped.
+MISFIRE_GRACE_SECONDS = int(os.getenv("SCHEDULER_MISFIRE_GRACE_SECONDS", "300"))
 
 
 class SchedulerService:
@@ -49,6 +51,15 @@ class SchedulerService:
             self.scheduler.shutdown(wait=False)
         self._job_handles.clear()
 
+    def pause(self) -> None:
+        """Hold job firings (e.g. while a backup is restored); paired with :meth:`resume`."""
+        if self.scheduler.running:
+            self.scheduler.pause()
+
+    def resume(self) -> None:
+        if self.scheduler.running:
+            self.scheduler.resume()
+
     async def set_enabled(self, enabled: bool) -> None:
         self.enabled = enabled
         if enabled:
@@ -61,13 +72,8 @@ class SchedulerService:
             await self._unschedule_all()
             if not self.enabled:
                 return
-            session = SessionLocal()
-            try:
-                jobs = session.query(ScheduledJob).filter(ScheduledJob.enabled.is_(True)).all()
-                for job in jobs:
-                    self._schedule_job(job)
-            finally:
-                session.close()
+            for job in await asyncio.to_thread(self._load_enabled_jobs):
+                self._schedule_job(job)
 
     def validate_schedule(self, schedule_type: str, cron_expression: Optional[str], interval_minutes: Optional[int], timezone: Optional[str]) -> None:
         tz = self._resolve_timezone(timezone)
@@ -86,25 +92,37 @@ class SchedulerService:
             await self._unschedule_job(job_id)
             if not self.enabled:
                 return
-            session = SessionLocal()
-            try:
-                job = session.get(ScheduledJob, job_id)
-                if job and job.enabled:
-                    self._schedule_job(job)
-            finally:
-                session.close()
+            job = await asyncio.to_thread(self._load_job, job_id)
+            if job and job.enabled:
+                self._schedule_job(job)
 
     async def remove_job(self, job_id: int) -> None:
         await self._unschedule_job(job_id)
 
     async def run_job_now(self, job_id: int) -> Optional[int]:
+        if not await asyncio.to_thread(self._load_job, job_id):
+            return None
+        return await self._run_job(job_id, force=True)
+
+    # Session work below runs in worker threads (asyncio.to_thread) so a busy database never
+    # blocks the event loop; jobs are returned detached, with their columns loaded.
+
+    def _load_enabled_jobs(self) -> List[ScheduledJob]:
+        session = SessionLocal()
+        try:
+            jobs = session.query(ScheduledJob).filter(ScheduledJob.enabled.is_(True)).all()
+            session.expunge_all()
+            return jobs
+        finally:
+            session.close()
+
+    def _load_job(self, job_id: int) -> Optional[ScheduledJob]:
         session = SessionLocal()
         try:
             job = session.get(ScheduledJob, job_id)
-            if not job:
-                return None
-            # Execute outside current session to avoid cross-thread state
-            return await self._run_job(job_id, force=True)
+            if job:
+                session.expunge(job)
+            return job
         finally:
             session.close()
 
@@ -140,6 +158,7 @@ class SchedulerService:
             replace_existing=True,
             max_instances=1 if job.skip_if_running else 3,
             coalesce=True,
+            misfire_grace_time=MISFIRE_GRACE_SECONDS,
         )
         self._job_handles[job.id] = aps_job.id
         logger.debug("Scheduled job id=%s with trigger %s", job.id, trigger)
@@ -169,40 +188,10 @@ class SchedulerService:
             return None
 
     async def _run_job(self, job_id: int, force: bool = False) -> Optional[int]:
-        session = SessionLocal()
-        job = session.get(ScheduledJob, job_id)
-        if not job:
-            session.close()
-            logger.warning("Job id=%s no longer exists", job_id)
+        started = await asyncio.to_thread(self._start_run, job_id, force)
+        if started is None:
             return None
-        if not self.enabled and not force:
-            session.close()
-            logger.info("Scheduler disabled; skipping job id=%s", job_id)
-            return None
-        if not job.enabled and not force:
-            session.close()
-            logger.info("Job id=%s disabled; skipping execution", job_id)
-            return None
-
-        run_record = ScheduledJobRun(
-            job_id=job.id,
-            status="running",
-            payload_snapshot=job.payload or {},
-        )
-        session.add(run_record)
-        session.commit()
-        session.refresh(run_record)
-        run_id = run_record.id
-        session.expunge(job)
-        session.close()
-
-        job_payload = {
-            "id": job.id,
-            "job_type": job.job_type,
-            "skip_if_running": job.skip_if_running,
-            "skip_if_manual_running": job.skip_if_manual_running,
-            "payload": job.payload or {},
-        }
+        run_id, job_payload = started
 
         status = "success"
         detail_message = ""
@@ -228,41 +217,78 @@ class SchedulerService:
             detail_message = f"{type(exc).__name__}: {exc}"
             logger.exception("Scheduled job id=%s failed", job_id)
         finally:
-            finished_ts = datetime.utcnow()
-            log_text = log_buffer.getvalue()
-            log_path: Optional[Path] = None
-            if log_text:
-                log_path = LOG_DIR / f"job_{job_id}" / f"run_{run_id}.log"
-                log_path.parent.mkdir(parents=True, exist_ok=True)
-                try:
-                    log_path.write_text(log_text)
-                except OSError as write_exc:
-                    logger.error("Failed to write scheduler log %s: %s", log_path, write_exc)
-                    log_path = None
-
-            update_session = SessionLocal()
-            try:
-                run = update_session.get(ScheduledJobRun, run_id)
-                if run:
-                    run.status = status
-                    run.finished_at = finished_ts
-                    run.detail = detail_message
-                    run.log_excerpt = (log_text[:2000]) if log_text else None
-                    run.log_path = str(log_path) if log_path else None
-                    update_session.add(run)
-                job_row = update_session.get(ScheduledJob, job_id)
-                if job_row:
-                    job_row.last_run_at = finished_ts
-                    update_session.add(job_row)
-                update_session.commit()
-            finally:
-                update_session.close()
+            await asyncio.to_thread(
+                self._finish_run, job_id, run_id, status, detail_message, log_buffer.getvalue()
+            )
 
         if exception and not force:
             # Propagate failure so APScheduler can record it, but we've already logged details
             raise exception
         return run_id
 
+    def _start_run(self, job_id: int, force: bool) -> Optional[Tuple[int, Dict[str, Any]]]:
+        """Record a ``running`` row for the job and return its id with the job payload."""
+        session = SessionLocal()
+        try:
+            job = session.get(ScheduledJob, job_id)
+            if not job:
+                logger.warning("Job id=%s no longer exists", job_id)
+                return None
+            if not self.enabled and not force:
+                logger.info("Scheduler disabled; skipping job id=%s", job_id)
+                return None
+            if not job.enabled and not force:
+                logger.info("Job id=%s disabled; skipping execution", job_id)
+                return None
+
+            run_record = ScheduledJobRun(
+                job_id=job.id,
+                status="running",
+                payload_snapshot=job.payload or {},
+            )
+            session.add(run_record)
+            session.commit()
+            session.refresh(run_record)
+            return run_record.id, {
+                "id": job.id,
+                "job_type": job.job_type,
+                "skip_if_running": job.skip_if_running,
+                "skip_if_manual_running": job.skip_if_manual_running,
+                "payload": job.payload or {},
+            }
+        finally:
+            session.close()
+
+    def _finish_run(self, job_id: int, run_id: int, status: str, detail_message: str, log_text: str) -> None:
+        finished_ts = datetime.utcnow()
+        log_path: Optional[Path] = None
+        if log_text:
+            log_path = LOG_DIR / f"job_{job_id}" / f"run_{run_id}.log"
+            log_path.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                log_path.write_text(log_text)
+            except OSError as write_exc:
+                logger.error("Failed to write scheduler log %s: %s", log_path, write_exc)
+                log_path = None
+
+        update_session = SessionLocal()
+        try:
+            run = update_session.get(ScheduledJobRun, run_id)
+            if run:
+                run.status = status
+                run.finished_at = finished_ts
+                run.detail = detail_message
+                run.log_excerpt = (log_text[:2000]) if log_text else None
+                run.log_path = str(log_path) if log_path else None
+                update_session.add(run)
+            job_row = update_session.get(ScheduledJob, job_id)
+            if job_row:
+                job_row.last_run_at = finished_ts
+                update_session.add(job_row)
+            update_session.commit()
+        finally:
+            update_session.close()
+
     def _execute_job(self, job_payload: Dict[str, Any], log_buffer: io.StringIO) -> Dict[str, Any]:
         with redirect_stdout(log_buffer), redirect_stderr(log_buffer):
             payload = job_payload.get("payload") or {}
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import threading
+from types import SimpleNamespace
+from typing import Optional
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session
+
+from ..models import SystemSetting, ensure_default_settings
+
+
+class SettingsCache:
+    """Process-local, read-only snapshot of the system settings row.
+
+    Read paths use :meth:`get`; every endpoint that writes the settings row must call
+    :meth:`invalidate` after committing so the next read reloads it. Deferred columns
+    (the Apify token) are left out of the snapshot; check ``has_apify_token`` instead.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._snapshot: Optional[SimpleNamespace] = None
+        self._snapshot_version = -1
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def get(self, session: Session) -> SimpleNamespace:
+        with self._lock:
+            if self._snapshot is not None and self._snapshot_version == self._version:
+                return self._snapshot
+            version = self._version
+
+        setting = ensure_default_settings(session)
+        snapshot = SimpleNamespace(
+            **{
+                attr.key: getattr(setting, attr.key)
+                for attr in inspect(SystemSetting).column_attrs
+                if not attr.deferred
+            }
+        )
+
+        with self._lock:
+            # Only publish the snapshot if nothing was written while it was being loaded.
+            if version == self._version:
+                self._snapshot = snapshot
+                self._snapshot_version = version
+        return snapshot
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._version += 1
+            self._snapshot = None
+
+
+settings_cache = SettingsCache()
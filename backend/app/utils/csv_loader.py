@@ -1,21 +1,35 @@
 from __future__ import annotations
 
 import csv
+from datetime import datetime
 from io import StringIO
-from typing import Tuple
+from typing import Dict, Iterable, Tuple, Union
 
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
 from ..models import Club
 
+IMPORT_BATCH_SIZE = 500
 
-def import_clubs_from_csv(session: Session, csv_text: str) -> Tuple[int, int]:
+
+def import_clubs_from_csv(session: Session, csv_source: Union[str, Iterable[str]]) -> Tuple[int, int]:
+    """Upsert clubs from CSV text or an iterable of CSV lines.
+
+    Rows are written in batches of ``IMPORT_BATCH_SIZE`` with a single commit at the end,
+    so large files can be streamed without holding them in memory.
+    """
     created = 0
     updated = 0
+    if isinstance(csv_source, str):
+        csv_source = StringIO(csv_source)
+    reader = csv.DictReader(csv_source)
     # Remove UTF-8 BOM if present
-    if csv_text.startswith('\ufeff'):
-        csv_text = csv_text[1:]
-    reader = csv.DictReader(StringIO(csv_text))
+    if reader.fieldnames and reader.fieldnames[0].startswith('\ufeff'):
+        reader.fieldnames = [reader.fieldnames[0][1:], *reader.fieldnames[1:]]
+
+    batch: Dict[str, Dict] = {}
     for row in reader:
         # Support both original format and the clubs_instagram CSV format
         username = (row.get("username") or row.get("Instagram Handle") or "").strip()
@@ -36,21 +50,42 @@ def import_clubs_from_csv(session: Session, csv_text: str) -> Tuple[int, int]:
         classification_mode = (row.get("classification_mode") or row.get("mode") or "auto").strip().lower()
         classification_mode = "manual" if classification_mode == "manual" else "auto"
 
-        club = session.query(Club).filter(Club.username == username).one_or_none()
-        if club:
-            club.name = name
-            club.active = active_value in {"true", "1", "yes", "y"}
-            club.classification_mode = classification_mode
+        if username in batch:
+            # A repeated handle inside one batch updates the row queued before it.
             updated += 1
-        else:
-            club = Club(
-                name=name,
-                username=username,
-                active=active_value in {"true", "1", "yes", "y"},
-                classification_mode=classification_mode,
-            )
-            session.add(club)
-            session.flush()
-            created += 1
+        batch[username] = {
+            "name": name,
+            "username": username,
+            "active": active_value in {"true", "1", "yes", "y"},
+            "classification_mode": classification_mode,
+        }
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            batch_created, batch_updated = _upsert_club_batch(session, batch)
+            created += batch_created
+            updated += batch_updated
+            batch = {}
+
+    if batch:
+        batch_created, batch_updated = _upsert_club_batch(session, batch)
+        created += batch_created
+        updated += batch_updated
     session.commit()
     return created, updated
+
+
+def _upsert_club_batch(session: Session, batch: Dict[str, Dict]) -> Tuple[int, int]:
+    existing = set(session.execute(select(Club.username).where(Club.username.in_(list(batch)))).scalars())
+    now = datetime.utcnow()
+    rows = [{**values, "created_at": now, "updated_at": now} for values in batch.values()]
+    stmt = sqlite_insert(Club).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["username"],
+        set_={
+            "name": stmt.excluded.name,
+            "active": stmt.excluded.active,
+            "classification_mode": stmt.excluded.classification_mode,
+            "updated_at": stmt.excluded.updated_at,
+        },
+    )
+    session.execute(stmt)
+    return len(batch) - len(existing), len(existing)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import hashlib
+import logging
 import os
 from pathlib import Path
 from typing import Optional
@@ -10,6 +11,8 @@ import requests
 IMAGES_DIR = Path(__file__).parent.parent / "static" / "images"
 IMAGES_DIR.mkdir(parents=True, exist_ok=True)
 
+logger = logging.getLogger(__name__)
+
 
 def download_image(url: str, post_id: str) -> Optional[str]:
     """
@@ -51,7 +54,7 @@ def download_image(url: str, post_id: str) -> Optional[str]:
         return filename
 
     except Exception as e:
-        print(f"Failed to download image from {url}: {e}")
+        logger.warning("Failed to download image from %s: %s", url, e)
         return None
 
 
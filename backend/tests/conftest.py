@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+_TMP_DIR = Path(tempfile.mkdtemp(prefix="event-monitor-tests-"))
+
+# The app resolves its database, static and scheduler paths at import time.
+os.environ["DATABASE_PATH"] = str(_TMP_DIR / "test.db")
+os.environ["SCHEDULER_LOG_DIR"] = str(_TMP_DIR / "scheduler_logs")
+os.chdir(BACKEND_DIR)
+sys.path.insert(0, str(BACKEND_DIR))
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.database import Base, SessionLocal, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services.settings_cache import settings_cache  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def client():
+    # Starts from an empty database file; startup is expected to create the schema.
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture()
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture(autouse=True)
+def _clean_tables():
+    yield
+    with engine.begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            conn.execute(table.delete())
+    settings_cache.invalidate()
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import io
+import sqlite3
+import zipfile
+
+from sqlalchemy import text
+
+import app.main as main
+from app.database import DB_PATH, engine
+from app.models import Club
+from app.services.monitor import monitor_service
+
+
+def _backup_archive(tmp_path) -> bytes:
+    snapshot = tmp_path / "snapshot.db"
+    live = sqlite3.connect(DB_PATH)
+    target = sqlite3.connect(snapshot)
+    try:
+        live.backup(target)
+    finally:
+        target.close()
+        live.close()
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.write(snapshot, arcname="instagram_monitor.db")
+    return buffer.getvalue()
+
+
+def test_restore_is_visible_to_connections_that_stay_checked_out(client, db, tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "IMAGES_DIR", tmp_path / "images")
+    db.add(Club(name="Restored", username="restored"))
+    db.commit()
+    archive = _backup_archive(tmp_path)
+
+    db.query(Club).delete()
+    db.add(Club(name="Live", username="live"))
+    db.commit()
+
+    with engine.connect() as held:
+        held.execute(text("SELECT 1"))
+        response = client.post("/import/full", files={"file": ("backup.zip", archive, "application/zip")})
+        assert response.status_code == 200
+        held.rollback()
+        usernames = held.execute(text("SELECT username FROM clubs")).scalars().all()
+
+    assert usernames == ["restored"]
+    assert not DB_PATH.with_name(f"{DB_PATH.name}.importing").exists()
+
+
+def test_restore_is_refused_while_a_fetch_is_running(client, monkeypatch):
+    monkeypatch.setitem(monitor_service._active_runs, "manual", 1)
+    response = client.post("/import/full", files={"file": ("backup.zip", b"", "application/zip")})
+    assert response.status_code == 409
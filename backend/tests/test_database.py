@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import logging
+import sqlite3
+
+from app import database
+
+
+def test_periodic_optimize_logs_failures(monkeypatch, caplog):
+    class _FailingConnection:
+        def execute(self, sql):
+            raise sqlite3.OperationalError("database is locked")
+
+        def close(self):
+            pass
+
+    timeouts = []
+
+    def connect(path, timeout):
+        timeouts.append(timeout)
+        return _FailingConnection()
+
+    monkeypatch.setattr(database.sqlite3, "connect", connect)
+    with caplog.at_level(logging.WARNING, logger="app.database"):
+        database.run_periodic_optimize()
+
+    assert timeouts == [database.OPTIMIZE_BUSY_TIMEOUT_SECONDS]
+    assert "PRAGMA optimize failed" in caplog.text
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+
+def test_export_routes_document_their_streamed_schema(client):
+    spec = client.get("/openapi.json").json()
+    assert "ClubEventsExport" in spec["components"]["schemas"]
+
+    export = spec["paths"]["/events/export"]["get"]["responses"]["200"]["content"]
+    assert export["application/json"]["schema"]["items"]["$ref"] == "#/components/schemas/ClubEventsExport"
+
+    ndjson = spec["paths"]["/events/export.ndjson"]["get"]["responses"]["200"]["content"]
+    assert list(ndjson) == ["application/x-ndjson"]
+    assert ndjson["application/x-ndjson"]["schema"]["$ref"] == "#/components/schemas/ClubEventsExport"
+
+
+def test_exports_stream_with_their_media_types(client):
+    export = client.get("/events/export")
+    assert export.status_code == 200
+    assert export.headers["content-type"].startswith("application/json")
+    assert export.json() == []
+
+    ndjson = client.get("/events/export.ndjson")
+    assert ndjson.status_code == 200
+    assert ndjson.headers["content-type"].startswith("application/x-ndjson")
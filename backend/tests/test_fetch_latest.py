@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import pytest
+
+from app.models import Club
+from app.services.monitor import monitor_service
+
+
+@pytest.fixture(autouse=True)
+def _no_instaloader_session(monkeypatch):
+    monkeypatch.setattr(monitor_service, "loader", None)
+
+
+def test_no_active_clubs_is_reported_before_fetcher_readiness(client):
+    response = client.post("/monitor/fetch-latest")
+    assert response.status_code == 200
+    assert response.json()["message"] == "No active clubs found"
+
+
+def test_fetch_all_without_a_session_is_unavailable(client, db):
+    db.add(Club(name="Alpha", username="alpha"))
+    db.commit()
+
+    response = client.post("/monitor/fetch-latest")
+    assert response.status_code == 503
+    assert response.json()["detail"] == (
+        "Instaloader session is not available. Upload a session file or switch to Apify mode."
+    )
+
+    client.patch("/settings", json={"instagram_fetcher": "apify"})
+    response = client.post("/monitor/fetch-latest")
+    assert response.status_code == 503
+    assert response.json()["detail"] == "Apify integration is not configured. Add a personal API token before using Apify mode."
+
+
+def test_fetch_club_checks_the_club_before_the_fetcher(client, db):
+    assert client.post("/clubs/999/fetch-latest").status_code == 404
+
+    club = Club(name="Alpha", username="alpha")
+    db.add(club)
+    db.commit()
+    response = client.post(f"/clubs/{club.id}/fetch-latest")
+    assert response.status_code == 503
+    assert response.json()["detail"] == "Instaloader session is not available. Upload a session file or switch fetcher."
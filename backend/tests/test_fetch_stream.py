@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import asyncio
+
+from app.main import fetch_latest_posts_stream
+from app.models import Club
+from app.services.monitor import monitor_service
+
+
+class _ConnectedRequest:
+    async def is_disconnected(self) -> bool:
+        return False
+
+
+def test_clubs_finished_before_a_disconnect_are_kept(client, db, monkeypatch):
+    db.add_all([Club(name="Alpha", username="alpha"), Club(name="Beta", username="beta")])
+    db.commit()
+
+    monkeypatch.setattr(monitor_service, "loader", object())
+    monkeypatch.setattr(monitor_service, "_fetch_latest_posts_for_club", lambda *args: [])
+    monkeypatch.setattr(monitor_service, "_apply_delay", lambda *args: None)
+
+    async def consume_until_second_club():
+        response = await fetch_latest_posts_stream(_ConnectedRequest(), post_count=3, db=db)
+        stream = response.body_iterator
+        async for chunk in stream:
+            if b'"current_club":"beta"' in chunk:
+                break
+        # Starlette closes the generator at its pending yield when the client goes away.
+        await stream.aclose()
+
+    asyncio.run(consume_until_second_club())
+
+    db.expire_all()
+    checked = {club.username: club.last_checked for club in db.query(Club)}
+    assert checked["alpha"] is not None
+    assert checked["beta"] is None
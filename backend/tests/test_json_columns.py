@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import json
+import math
+from datetime import datetime
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import StatementError
+
+from app.models import ScheduledJob
+
+
+def test_legacy_rows_with_non_finite_floats_still_load(client, db):
+    # The stdlib serializer used before orjson wrote NaN/Infinity literals.
+    legacy_payload = json.dumps({"threshold": float("nan"), "limit": float("inf")})
+    db.execute(
+        text(
+            "INSERT INTO scheduled_jobs (name, job_type, schedule_type, enabled, skip_if_running, "
+            "skip_if_manual_running, payload, created_at, updated_at) "
+            "VALUES ('legacy', 'monitor', 'interval', 1, 1, 1, :payload, '2024-01-01', '2024-01-01')"
+        ),
+        {"payload": legacy_payload},
+    )
+    db.commit()
+
+    payload = db.query(ScheduledJob).one().payload
+    assert math.isnan(payload["threshold"])
+    assert payload["limit"] == float("inf")
+
+
+def _stored_payload(db, payload):
+    db.add(ScheduledJob(name="job", job_type="monitor", payload=payload))
+    db.commit()
+    raw = db.execute(text("SELECT payload FROM scheduled_jobs")).scalar_one()
+    db.expire_all()
+    return raw, db.query(ScheduledJob).one().payload
+
+
+def test_plain_payloads_are_written_by_orjson(client, db):
+    raw, payload = _stored_payload(db, {"clubs": ["a", "b"], "limit": 3, "note": None})
+    assert raw == '{"clubs":["a","b"],"limit":3,"note":null}'
+    assert payload == {"clubs": ["a", "b"], "limit": 3, "note": None}
+
+
+def test_non_finite_floats_are_written_as_before(client, db):
+    raw, payload = _stored_payload(db, {"threshold": float("nan"), "limit": float("-inf"), "note": None})
+    assert raw == json.dumps({"threshold": float("nan"), "limit": float("-inf"), "note": None})
+    assert math.isnan(payload["threshold"])
+    assert payload["limit"] == float("-inf")
+
+
+def test_integers_beyond_64_bits_are_written_as_before(client, db):
+    big = 2**70
+    raw, payload = _stored_payload(db, {"id": big})
+    assert raw == json.dumps({"id": big})
+    assert payload == {"id": big}
+
+
+def test_datetimes_are_still_rejected(client, db):
+    db.add(ScheduledJob(name="job", job_type="monitor", payload={"at": datetime(2024, 1, 1)}))
+    with pytest.raises(StatementError):
+        db.commit()
+    db.rollback()
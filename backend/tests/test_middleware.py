@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.middleware import PureCORSMiddleware
+
+
+def _varied(request):
+    return PlainTextResponse("ok", headers={"Vary": "Accept-Encoding"})
+
+
+def _client(**options) -> TestClient:
+    app = Starlette(routes=[Route("/", _varied)])
+    return TestClient(PureCORSMiddleware(app, **options))
+
+
+def test_origin_is_merged_into_an_existing_vary_header():
+    response = _client().get("/", headers={"Origin": "https://example.org"})
+    assert response.headers.get_list("vary") == ["Accept-Encoding, Origin"]
+    assert response.headers["access-control-allow-origin"] == "https://example.org"
+    assert "access-control-expose-headers" not in response.headers
+
+
+def test_expose_headers_are_sent_on_cross_origin_responses():
+    response = _client(expose_headers=["X-Next-Cursor"]).get("/", headers={"Origin": "https://example.org"})
+    assert response.headers["access-control-expose-headers"] == "X-Next-Cursor"
+
+
+def test_same_origin_requests_are_left_alone():
+    response = _client(expose_headers=["X-Next-Cursor"]).get("/")
+    assert response.headers.get_list("vary") == ["Accept-Encoding"]
+    assert "access-control-allow-origin" not in response.headers
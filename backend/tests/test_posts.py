@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select, tuple_
+
+from app.database import engine
+from app.models import Club, Post
+
+
+def _add_posts(db, timestamps):
+    club = Club(name="Chess Club", username="chessclub")
+    db.add(club)
+    db.flush()
+    for instagram_id, timestamp in timestamps:
+        db.add(Post(club_id=club.id, instagram_id=instagram_id, post_timestamp=timestamp))
+    db.commit()
+
+
+def _walk_pages(client, limit, **params):
+    seen = []
+    cursor = None
+    while True:
+        query = dict(params, limit=limit)
+        if cursor:
+            query["cursor"] = cursor
+        response = client.get("/posts", params=query)
+        assert response.status_code == 200
+        seen.extend(post["instagram_id"] for post in response.json())
+        cursor = response.headers.get("x-next-cursor")
+        if not cursor:
+            return seen
+
+
+def test_cursor_pages_do_not_skip_posts_sharing_a_timestamp(client, db):
+    shared = datetime(2024, 5, 1, 12, 0, 0)
+    _add_posts(
+        db,
+        [("pz", datetime(2024, 5, 2, 9, 30, 0))] + [(f"p{i}", shared) for i in range(5)],
+    )
+
+    first = client.get("/posts", params={"limit": 2})
+    assert [post["instagram_id"] for post in first.json()] == ["pz", "p4"]
+    second = client.get("/posts", params={"limit": 2, "cursor": first.headers["x-next-cursor"]})
+    assert [post["instagram_id"] for post in second.json()] == ["p3", "p2"]
+
+    assert sorted(_walk_pages(client, limit=2)) == ["p0", "p1", "p2", "p3", "p4", "pz"]
+
+
+def test_last_partial_page_has_no_next_cursor(client, db):
+    _add_posts(db, [("only", datetime(2024, 5, 1))])
+
+    response = client.get("/posts", params={"limit": 5})
+    assert [post["instagram_id"] for post in response.json()] == ["only"]
+    assert "x-next-cursor" not in response.headers
+
+
+def test_malformed_cursor_is_rejected(client):
+    response = client.get("/posts", params={"cursor": "yesterday"})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize(
+    "status_filter",
+    [None, Post.is_event_poster.is_(None), Post.is_event_poster.is_(True), Post.is_event_poster.is_(False)],
+)
+def test_post_pages_are_read_in_index_order(client, status_filter):
+    stmt = (
+        select(Post)
+        .where(tuple_(Post.post_timestamp, Post.id) < tuple_(datetime(2024, 5, 1), 10))
+        .order_by(Post.post_timestamp.desc(), Post.id.desc())
+        .limit(20)
+    )
+    if status_filter is not None:
+        stmt = stmt.where(status_filter)
+    sql = str(stmt.compile(engine, compile_kwargs={"literal_binds": True}))
+    with engine.connect() as conn:
+        plan = " ".join(row[3] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}"))
+    assert "USING INDEX ix_posts_" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_next_cursor_header_is_documented_and_exposed(client, db):
+    _add_posts(db, [("a", datetime(2024, 5, 1)), ("b", datetime(2024, 5, 2))])
+
+    response = client.get("/posts", params={"limit": 1}, headers={"Origin": "https://frontend.example"})
+    assert response.headers["x-next-cursor"]
+    assert response.headers["access-control-expose-headers"] == "X-Next-Cursor"
+
+    operation = client.get("/openapi.json").json()["paths"]["/posts"]["get"]
+    ok = operation["responses"]["200"]
+    assert "X-Next-Cursor" in ok["headers"]
+    assert ok["content"]["application/json"]["schema"]["items"]["$ref"].endswith("/PostOut")
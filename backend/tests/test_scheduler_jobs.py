@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+
+def test_scheduled_job_create_update_delete(client):
+    created = client.post(
+        "/scheduler/jobs",
+        json={"name": "Nightly pull", "job_type": "apify_pull", "schedule_type": "interval", "interval_minutes": 60},
+    )
+    assert created.status_code == 201
+    job_id = created.json()["id"]
+
+    updated = client.patch(f"/scheduler/jobs/{job_id}", json={"name": "Hourly pull"})
+    assert updated.status_code == 200
+    assert updated.json()["name"] == "Hourly pull"
+    assert updated.json()["interval_minutes"] == 60
+
+    assert client.delete(f"/scheduler/jobs/{job_id}").status_code == 204
+    assert client.get(f"/scheduler/jobs/{job_id}").status_code == 404
+
+
+def test_unknown_scheduled_job_is_404(client):
+    assert client.patch("/scheduler/jobs/999", json={"name": "x"}).status_code == 404
+    assert client.delete("/scheduler/jobs/999").status_code == 404
+    assert client.post("/scheduler/jobs/999/run").status_code == 404
+
+
+def _create_job(client, **overrides):
+    payload = {"name": "Nightly pull", "job_type": "apify_pull", "schedule_type": "interval", "interval_minutes": 60}
+    payload.update(overrides)
+    return client.post("/scheduler/jobs", json=payload).json()["id"]
+
+
+def test_triggered_run_is_recorded(client, monkeypatch):
+    from app.services.scheduler import scheduler_service
+
+    def fake_execute(job_payload, log_buffer):
+        log_buffer.write("pulled 0 posts\n")
+        return {"job": job_payload["job_type"], "status": "completed"}
+
+    monkeypatch.setattr(scheduler_service, "_execute_job", fake_execute)
+    job_id = _create_job(client)
+
+    run = client.post(f"/scheduler/jobs/{job_id}/run")
+    assert run.status_code == 200
+    body = run.json()
+    assert body["status"] == "success"
+    assert body["finished_at"] is not None
+    assert body["log_excerpt"] == "pulled 0 posts\n"
+    assert client.get(f"/scheduler/jobs/{job_id}").json()["last_run_at"] is not None
+
+
+def test_enabling_the_scheduler_schedules_enabled_jobs(client):
+    from app.services.scheduler import scheduler_service
+
+    enabled_id = _create_job(client)
+    disabled_id = _create_job(client, enabled=False)
+    try:
+        assert client.patch("/settings", json={"scheduler_enabled": True}).status_code == 200
+        assert enabled_id in scheduler_service._job_handles
+        assert disabled_id not in scheduler_service._job_handles
+    finally:
+        client.patch("/settings", json={"scheduler_enabled": False})
+    assert not scheduler_service._job_handles
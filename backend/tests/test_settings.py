@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import pytest
+
+
+def test_fetcher_and_classification_mode_are_normalized(client):
+    response = client.patch("/settings", json={"instagram_fetcher": " APIFY ", "classification_mode": "Manual"})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["instagram_fetcher"] == "apify"
+    assert body["apify_enabled"] is True
+    assert body["classification_mode"] == "manual"
+
+
+@pytest.mark.parametrize(
+    ("payload", "detail"),
+    [
+        ({"monitor_interval_minutes": 0}, "Monitor interval must be at least 1 minute"),
+        ({"club_fetch_delay_seconds": -1}, "Club fetch delay cannot be negative"),
+        ({"instagram_fetcher": "selenium"}, "Invalid Instagram fetcher selection"),
+    ],
+)
+def test_out_of_range_settings_are_rejected_with_400(client, payload, detail):
+    response = client.patch("/settings", json=payload)
+    assert response.status_code == 400
+    assert response.json()["detail"] == detail
+
+
+def test_unknown_classification_mode_is_rejected(client):
+    assert client.patch("/settings", json={"classification_mode": "sometimes"}).status_code == 422
+
+
+def test_settings_snapshot_exposes_token_presence_but_not_the_token(client, db):
+    from app.services.monitor import monitor_service
+    from app.services.settings_cache import settings_cache
+
+    response = client.post("/settings/apify/token", json={"token": "secret-token"})
+    assert response.status_code == 200
+    assert response.json()["has_apify_token"] is True
+
+    snapshot = settings_cache.get(db)
+    assert snapshot.has_apify_token is True
+    assert not hasattr(snapshot, "apify_api_token")
+    assert monitor_service._load_apify_token() == "secret-token"
+
+    assert client.delete("/settings/apify/token").json()["has_apify_token"] is False
+    assert settings_cache.get(db).has_apify_token is False
+
+
+def test_apify_client_survives_unrelated_settings_writes(client, db, monkeypatch):
+    from app.services.monitor import monitor_service
+    from app.services.settings_cache import settings_cache
+
+    monkeypatch.setattr(monitor_service, "_apify_client", None)
+    monkeypatch.setattr(monitor_service, "_apify_signature", None)
+    monkeypatch.setattr(monitor_service, "_apify_settings_version", None)
+    client.post("/settings/apify/token", json={"token": "first-token"})
+    client.patch("/settings", json={"instagram_fetcher": "apify"})
+
+    apify_client = monitor_service._get_apify_client(settings_cache.get(db))
+    assert apify_client is not None
+
+    assert client.patch("/settings", json={"monitor_interval_minutes": 30}).status_code == 200
+    assert monitor_service._get_apify_client(settings_cache.get(db)) is apify_client
+
+    client.post("/settings/apify/token", json={"token": "second-token"})
+    rotated = monitor_service._get_apify_client(settings_cache.get(db))
+    assert rotated is not apify_client
+    assert rotated.api_token == "second-token"
+    rotated.close()
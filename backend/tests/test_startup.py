@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from sqlalchemy import inspect
+
+from app.database import Base, engine
+from app.main import _prepare_database
+
+
+def test_startup_creates_schema_on_empty_database(client):
+    Base.metadata.drop_all(bind=engine)
+    assert not inspect(engine).has_table("system_settings")
+
+    _prepare_database()
+
+    tables = set(inspect(engine).get_table_names())
+    assert {"clubs", "posts", "extracted_events", "system_settings"} <= tables
+    assert client.get("/settings").status_code == 200
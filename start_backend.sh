@@ -17,6 +17,9 @@ else
     source .venv/bin/activate
 fi
 
+# Create or upgrade the database schema
+python -m app.scripts.migrate
+
 # Start the server
 echo "Starting server on http://localhost:8000"
 python -m uvicorn app.main:app --host 127.0.0.1 --port 8000 --reload
\ No newline at end of file